@@ -0,0 +1,198 @@
+"""
+Microbenchmarks of the news server's per-response CPU work over recorded response fixtures.
+
+Times each stage of a tool call separately: decoding the RDP response body, extracting the
+simplified headlines or story, shaping them to the tool's output profile, and encoding
+the tool result. Cases run from a small response to a 1000-headline page and a
+multi-MB HTML story, so the cost can be compared before and after an optimization:
+
+    python benchmarks/bench_extraction.py                 # print timings
+    python benchmarks/bench_extraction.py --save          # also append them to the results file
+    python benchmarks/bench_extraction.py --compare abc1234  # compare with the results saved at a commit
+
+Results are saved with the commit they were measured at in benchmarks/results/extraction.jsonl.
+Compare results measured on the same machine only. Decoding and encoding use the news server's
+JSON codec; set RDP_JSON_CODEC=stdlib to time the json module instead of orjson.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+RESULTS_FILE = os.path.join(ROOT, "benchmarks", "results", "extraction.jsonl")
+
+sys.path.append(os.path.join(ROOT, "mcp-servers"))
+import news_json  # noqa: E402
+from news_format import extract_headline, extract_story, shape_headline, shape_story  # noqa: E402
+
+LARGE_HEADLINES = 1000
+LARGE_STORY_BYTES = 3 * 1024 * 1024
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES, f"{name}.json")) as f:
+        return json.load(f)
+
+
+def large_headlines(page: dict) -> dict:
+    """A page of LARGE_HEADLINES headlines built from the items of a recorded page"""
+    items = []
+    for i in range(LARGE_HEADLINES):
+        item = copy.deepcopy(page["data"][i % len(page["data"])])
+        item["storyId"] = f"{item['storyId']}-{i}"
+        items.append(item)
+    return {"data": items, "meta": {**page["meta"], "count": len(items)}}
+
+
+def large_story(story: dict) -> dict:
+    """A recorded story with its HTML body repeated to LARGE_STORY_BYTES"""
+    story = copy.deepcopy(story)
+    inline = story["newsItem"]["contentSet"]["inlineData"][0]
+    inline["$"] = inline["$"] * (LARGE_STORY_BYTES // len(inline["$"]) + 1)
+    return story
+
+
+def encode_response(response: dict) -> bytes:
+    # The API sends compact JSON
+    return json.dumps(response, separators=(",", ":")).encode()
+
+
+def headline_stages(body: bytes) -> dict[str, Callable[[], object]]:
+    page = news_json.loads(body)
+    headlines = [extract_headline(item) for item in page["data"]]
+    shaped = [shape_headline(headline, "standard") for headline in headlines]
+    return {
+        "decode": lambda: news_json.loads(body),
+        "extract": lambda: [extract_headline(item) for item in page["data"]],
+        "shape": lambda: [shape_headline(headline, "standard") for headline in headlines],
+        "encode": lambda: news_json.dumps({"headlines": shaped, "next_cursor": page["meta"].get("next")}),
+    }
+
+
+def story_stages(body: bytes) -> dict[str, Callable[[], object]]:
+    data = news_json.loads(body)
+    story = extract_story("urn:newsml:reuters.com:20250610:nX0000000", data)
+    shaped = shape_story(story, "standard")
+    return {
+        "decode": lambda: news_json.loads(body),
+        "extract": lambda: extract_story("urn:newsml:reuters.com:20250610:nX0000000", data),
+        "shape": lambda: shape_story(story, "standard"),
+        "encode": lambda: news_json.dumps(shaped),
+    }
+
+
+def cases() -> dict[str, tuple[int, dict[str, Callable[[], object]]]]:
+    headlines_typical = load_fixture("headlines_typical")
+    story_typical = load_fixture("story_typical")
+    bodies = {
+        "headlines_small": (headline_stages, encode_response(load_fixture("headlines_small"))),
+        "headlines_typical": (headline_stages, encode_response(headlines_typical)),
+        "headlines_large": (headline_stages, encode_response(large_headlines(headlines_typical))),
+        "story_small": (story_stages, encode_response(load_fixture("story_small"))),
+        "story_typical": (story_stages, encode_response(story_typical)),
+        "story_large": (story_stages, encode_response(large_story(story_typical))),
+    }
+    return {name: (len(body), stages(body)) for name, (stages, body) in bodies.items()}
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Median time of one call in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def run(repeat: int, only: Optional[list[str]] = None) -> dict:
+    results = {}
+    for name, (size, stages) in cases().items():
+        if only and name not in only:
+            continue
+        results[name] = {"bytes": size}
+        results[name].update({stage: round(time_call(fn, repeat), 4) for stage, fn in stages.items()})
+    return results
+
+
+def current_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_saved(commit: str) -> Optional[dict]:
+    """The latest saved results measured at a commit"""
+    if not os.path.exists(RESULTS_FILE):
+        return None
+    found = None
+    with open(RESULTS_FILE) as f:
+        for line in f:
+            record = json.loads(line)
+            if record["commit"].startswith(commit):
+                found = record
+    return found
+
+
+def print_results(results: dict, baseline: Optional[dict] = None):
+    stages = ("decode", "extract", "shape", "encode")
+    print(f"{'case':<20}{'bytes':>12}" + "".join(f"{stage + ' ms':>16}" for stage in stages))
+    for name, result in results.items():
+        row = f"{name:<20}{result['bytes']:>12}"
+        for stage in stages:
+            cell = f"{result[stage]:.3f}"
+            previous = (baseline or {}).get(name, {}).get(stage)
+            if previous:
+                cell += f" ({result[stage] / previous:.2f}x)"
+            row += f"{cell:>16}"
+        print(row)
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks of news response processing")
+    parser.add_argument("--case", action="append", help="Case to run (repeatable, default all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per stage")
+    parser.add_argument("--save", action="store_true", help=f"Append the results to {os.path.relpath(RESULTS_FILE, ROOT)}")
+    parser.add_argument("--compare", metavar="COMMIT", help="Show timings relative to the results saved at COMMIT")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        record = load_saved(args.compare)
+        if record is None:
+            parser.error(f"no saved results for commit {args.compare}")
+        baseline = record["results"]
+
+    results = run(args.repeat, args.case)
+    print_results(results, baseline)
+
+    if args.save:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        record = {
+            "commit": current_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "json_codec": news_json.CODEC,
+            "machine": platform.platform(),
+            "results": results,
+        }
+        with open(RESULTS_FILE, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
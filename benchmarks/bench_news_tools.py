@@ -0,0 +1,211 @@
+"""
+Load benchmark of the news server's MCP tools over stdio.
+
+Starts news-server.py as an MCP stdio server pointed at an RDP API (by default a mock
+started by this script), calls the tools concurrently and reports throughput and latency
+percentiles per tool:
+
+    python benchmarks/bench_news_tools.py --requests 200 --concurrency 10
+    python benchmarks/bench_news_tools.py --mock-args "--latency-ms 50 --rate-limit-rate 0.05"
+    python benchmarks/bench_news_tools.py --base-url http://127.0.0.1:8002 --json results.json
+
+Caches and client-side rate limits of the news server are off unless set with --server-env,
+so every call goes through the full request path.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEWS_SERVER = os.path.join(ROOT, "mcp-servers", "news-server.py")
+MOCK_SERVER = os.path.join(ROOT, "benchmarks", "mock_rdp_server.py")
+
+TOOLS = ("get_headlines", "get_news_story", "get_news_stories")
+
+
+def percentile(values: list[float], p: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(p) - 1]
+
+
+def summarize(tool: str, latencies: list[float], errors: int, elapsed: float) -> dict:
+    return {
+        "tool": tool,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+    }
+
+
+def tool_arguments(tool: str, i: int, args: argparse.Namespace) -> dict:
+    story_id = f"urn:newsml:mock.example.com:20250101:n{i % args.distinct_stories:08d}"
+    if tool == "get_headlines":
+        return {"user_query": f"query {i % args.distinct_queries}", "limit": args.headlines_limit}
+    if tool == "get_news_story":
+        return {"storyId": story_id}
+    return {
+        "story_ids": [
+            f"urn:newsml:mock.example.com:20250101:n{(i * args.batch_size + j) % args.distinct_stories:08d}"
+            for j in range(args.batch_size)
+        ]
+    }
+
+
+async def run_tool(session: ClientSession, tool: str, args: argparse.Namespace) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def call(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            result = await session.call_tool(tool, tool_arguments(tool, i, args))
+            latencies.append(time.perf_counter() - start)
+            text = result.content[0].text if result.content else ""
+            if result.isError or text.startswith("Error"):
+                errors += 1
+
+    # Warm up the connection pool and token before measuring
+    await call(-1)
+    latencies.clear()
+    errors = 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(args.requests)))
+    return summarize(tool, latencies, errors, time.perf_counter() - start)
+
+
+def server_env(base_url: str, workdir: str, overrides: list[str]) -> dict:
+    env = {
+        **os.environ,
+        "RDP_BASE_URL": base_url,
+        "RDP_USERNAME": "benchmark",
+        "RDP_PASSWORD": "benchmark",
+        "RDP_CLIENT_ID": "benchmark",
+        "RDP_TOKEN_CACHE_FILE": os.path.join(workdir, "token.json"),
+        "RDP_STORY_CACHE_FILE": os.path.join(workdir, "stories.sqlite3"),
+        "RDP_NEWS_INDEX_FILE": os.path.join(workdir, "news_index.sqlite3"),
+        "RDP_HEADLINES_CACHE_TTL": "0",
+        "RDP_STORY_CACHE_MAX_MB": "0",
+        "RDP_HEADLINES_RATE": "0",
+        "RDP_STORIES_RATE": "0",
+    }
+    for override in overrides:
+        key, _, value = override.partition("=")
+        env[key] = value
+    return env
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(port: int, mock_args: str) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, MOCK_SERVER, "--port", str(port), *shlex.split(mock_args)]
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/mock/stats", timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Mock RDP server did not start")
+
+
+async def benchmark(args: argparse.Namespace, base_url: str) -> list[dict]:
+    with tempfile.TemporaryDirectory() as workdir:
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=[NEWS_SERVER],
+            env=server_env(base_url, workdir, args.server_env),
+        )
+        with open(os.devnull, "w") as devnull:
+            async with stdio_client(params, errlog=devnull) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    return [await run_tool(session, tool, args) for tool in args.tool]
+
+
+def print_results(results: list[dict], upstream: Optional[dict]):
+    columns = ("tool", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    print(" ".join(f"{column:>16}" for column in columns))
+    for result in results:
+        print(" ".join(f"{result[column]!s:>16}" for column in columns))
+    if upstream is not None:
+        print(f"Upstream requests: {json.dumps(upstream, sort_keys=True)}")
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the news MCP tools over stdio")
+    parser.add_argument("--tool", action="append", choices=TOOLS, help="Tool to benchmark (repeatable, default all)")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per tool")
+    parser.add_argument("--concurrency", type=int, default=10, help="Calls in flight at once")
+    parser.add_argument("--distinct-queries", type=int, default=50)
+    parser.add_argument("--distinct-stories", type=int, default=500)
+    parser.add_argument("--headlines-limit", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5, help="Stories per get_news_stories call")
+    parser.add_argument("--base-url", help="RDP API to use instead of starting the mock server")
+    parser.add_argument("--mock-args", default="", help="Arguments for mock_rdp_server.py, e.g. \"--latency-ms 50\"")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Environment variable for the news server (repeatable)")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+    args.tool = args.tool or list(TOOLS)
+
+    mock = None
+    base_url = args.base_url
+    if base_url is None:
+        port = free_port()
+        mock = start_mock(port, args.mock_args)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        results = asyncio.run(benchmark(args, base_url))
+        upstream = httpx.get(f"{base_url}/mock/stats").json() if mock else None
+    finally:
+        if mock is not None:
+            mock.terminate()
+            mock.wait()
+
+    print_results(results, upstream)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "settings": {key: value for key, value in vars(args).items() if key != "json"},
+                    "results": results,
+                    "upstream": upstream,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
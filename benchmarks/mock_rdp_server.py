@@ -0,0 +1,222 @@
+"""
+Local stand-in for the RDP token, headlines and stories endpoints used by the news server.
+
+Serves generated news with configurable latency, payload sizes and injected failures, so
+the news server can be load tested without credentials or the live API:
+
+    python benchmarks/mock_rdp_server.py --port 8002 --latency-ms 50 --story-kb 20
+    RDP_BASE_URL=http://127.0.0.1:8002 RDP_USERNAME=u RDP_PASSWORD=p RDP_CLIENT_ID=c \\
+        python mcp-servers/news-server.py
+
+GET /mock/stats returns the number of requests served per endpoint and status.
+"""
+
+import argparse
+import asyncio
+import base64
+import random
+import secrets
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+
+@dataclass
+class MockConfig:
+    # Response latency of the data endpoints, normally distributed, in milliseconds
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # Fractions of data requests failing with 503, 429 (with Retry-After) and 401
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    unauthorized_rate: float = 0.0
+    retry_after: float = 1.0
+    # Headlines available per query, and the size of generated story bodies
+    headlines_total: int = 1000
+    story_kb: float = 10.0
+    # Fraction of stories that are images, and the size of their (base64-encoded) data
+    image_rate: float = 0.0
+    image_kb: float = 500.0
+    # Lifetime of issued access tokens
+    token_expires_in: int = 600
+    seed: Optional[int] = None
+
+
+PARAGRAPH = (
+    "LONDON (Reuters) - Shares of the company rose in early trading after it reported "
+    "quarterly results ahead of analyst forecasts, helped by strong demand in its main "
+    "markets and lower costs. "
+)
+
+
+def create_app(config: MockConfig) -> Starlette:
+    rng = random.Random(config.seed)
+    tokens: set[str] = set()
+    refresh_tokens: set[str] = set()
+    stats: Counter = Counter()
+    paragraphs = max(1, -(-int(config.story_kb * 1024) // (len(PARAGRAPH) + 7)))
+    story_body = f"<p>{PARAGRAPH}</p>" * paragraphs
+    image_data = base64.b64encode(b"\xff" * int(config.image_kb * 1024 * 3 / 4)).decode()
+    now = datetime.now(timezone.utc)
+
+    def issue_token() -> JSONResponse:
+        access_token, refresh_token = secrets.token_hex(16), secrets.token_hex(16)
+        tokens.add(access_token)
+        refresh_tokens.add(refresh_token)
+        return JSONResponse(
+            {
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "expires_in": str(config.token_expires_in),
+                "scope": "trapi",
+                "token_type": "Bearer",
+            }
+        )
+
+    async def token(request: Request) -> Response:
+        form = await request.form()
+        if form.get("grant_type") == "refresh_token" and form.get("refresh_token") not in refresh_tokens:
+            stats["token 400"] += 1
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        stats["token 200"] += 1
+        return issue_token()
+
+    async def fail(request: Request, endpoint: str) -> Optional[Response]:
+        """Simulate latency and return an injected or authorization failure, if any"""
+        latency = config.latency_ms
+        if config.latency_jitter_ms:
+            latency = rng.gauss(latency, config.latency_jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+        access_token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        roll = rng.random()
+        if access_token not in tokens or roll < config.unauthorized_rate:
+            # An injected 401 revokes the token, as when a session is signed out
+            tokens.discard(access_token)
+            status, response = 401, JSONResponse({"error": {"message": "Unauthorized"}}, status_code=401)
+        elif roll < config.unauthorized_rate + config.rate_limit_rate:
+            status, response = 429, JSONResponse(
+                {"error": {"message": "Too many requests"}},
+                status_code=429,
+                headers={"Retry-After": f"{config.retry_after:g}"},
+            )
+        elif roll < config.unauthorized_rate + config.rate_limit_rate + config.error_rate:
+            status, response = 503, JSONResponse({"error": {"message": "Service unavailable"}}, status_code=503)
+        else:
+            return None
+        stats[f"{endpoint} {status}"] += 1
+        return response
+
+    def story_id(index: int) -> str:
+        return f"urn:newsml:mock.example.com:{now:%Y%m%d}:n{index:08d}"
+
+    async def headlines(request: Request) -> Response:
+        failure = await fail(request, "headlines")
+        if failure is not None:
+            return failure
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            query, _, offset = base64.urlsafe_b64decode(cursor.encode()).decode().rpartition("|")
+            offset = int(offset)
+        else:
+            query, offset = request.query_params.get("query", ""), 0
+        limit = min(int(request.query_params.get("limit", "10")), 100)
+        end = min(offset + limit, config.headlines_total)
+
+        data = []
+        for index in range(offset, end):
+            created = (now - timedelta(minutes=index)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            data.append(
+                {
+                    "storyId": story_id(index),
+                    "newsItem": {
+                        "itemMeta": {
+                            "title": [{"$": f"{query} headline {index}"}],
+                            "versionCreated": {"$": created},
+                        },
+                        "contentMeta": {
+                            "urgency": {"$": 1 if index % 10 == 0 else 3},
+                            "infoSource": [{"_qcode": "NS:RTRS", "_role": "sRole:source"}],
+                            "language": [{"_tag": "en"}],
+                        },
+                    },
+                }
+            )
+        meta = {"count": len(data)}
+        if end < config.headlines_total:
+            meta["next"] = base64.urlsafe_b64encode(f"{query}|{end}".encode()).decode()
+        stats["headlines 200"] += 1
+        return JSONResponse({"data": data, "meta": meta})
+
+    async def story(request: Request) -> Response:
+        failure = await fail(request, "stories")
+        if failure is not None:
+            return failure
+
+        requested_id = request.path_params["story_id"]
+        is_image = rng.random() < config.image_rate
+        stats["stories 200"] += 1
+        return JSONResponse(
+            {
+                "newsItem": {
+                    "itemMeta": {
+                        "versionCreated": {"$": now.strftime("%Y-%m-%dT%H:%M:%S.000Z")},
+                    },
+                    "contentMeta": {
+                        "headline": [{"$": f"Story {requested_id}"}],
+                        "urgency": {"$": 3},
+                        "infoSource": [{"_qcode": "NS:RTRS", "_role": "sRole:source"}],
+                        "language": [{"_tag": "en"}],
+                    },
+                    "contentSet": {
+                        "inlineData": [
+                            {"_contenttype": "image/jpeg", "$": image_data}
+                            if is_image
+                            else {"_contenttype": "text/html", "$": f"<html><body>{story_body}</body></html>"}
+                        ]
+                    },
+                }
+            }
+        )
+
+    async def mock_stats(request: Request) -> Response:
+        return JSONResponse(dict(stats))
+
+    return Starlette(
+        routes=[
+            Route("/auth/oauth2/v1/token", token, methods=["POST"]),
+            Route("/data/news/v1/headlines", headlines),
+            Route("/data/news/v1/stories/{story_id:path}", story),
+            Route("/mock/stats", mock_stats),
+        ]
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> tuple[argparse.Namespace, MockConfig]:
+    parser = argparse.ArgumentParser(description="Mock RDP news API for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    defaults = MockConfig()
+    for field, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=int if field in ("headlines_total", "token_expires_in", "seed") else float,
+            default=value,
+        )
+    args = parser.parse_args(argv)
+    config = MockConfig(**{field: getattr(args, field) for field in vars(defaults)})
+    return args, config
+
+
+if __name__ == "__main__":
+    args, config = parse_args()
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
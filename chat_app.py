@@ -1,16 +1,21 @@
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
+import uuid
 import uvicorn
 import os
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from langgraph.graph import START, StateGraph, MessagesState
+from langchain_mcp_adapters.tools import load_mcp_tools
+from langgraph.graph import START, StateGraph
 from langgraph.prebuilt import tools_condition, ToolNode
 from llm import get_default_chat_llm
+from mcp_session import SessionPool
+from chat_history import ChatState, HistoryManager, message_text, open_checkpointer
+from context_budget import ContextBudget, tokens_saved
 
 # Create FastAPI instance
 app = FastAPI(title="LangGraph Chat Interface")
@@ -19,33 +24,86 @@ app = FastAPI(title="LangGraph Chat Interface")
 # Pydantic models for API
 class ChatMessage(BaseModel):
     message: str
+    # Continue an earlier conversation; a new thread is started when omitted
+    thread_id: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
     response: str
+    thread_id: str
     tool_calls: List[Dict[str, Any]] = []
+    # Tokens of tool results kept out of the prompt by the context budget
+    tokens_saved: int = 0
 
 
-# Initialize LangGraph
-async def get_news_tools():
+# URL of a shared news server started with --transport streamable-http, e.g. http://localhost:8001/mcp.
+# When unset, the news server is spawned as a stdio subprocess.
+NEWS_MCP_URL = os.getenv("NEWS_MCP_URL")
+
+# Persistent sessions to the news server kept open for the app's lifetime, and how often they are pinged
+NEWS_MCP_SESSIONS = int(os.getenv("NEWS_MCP_SESSIONS", "1"))
+NEWS_MCP_HEALTH_CHECK_INTERVAL = float(os.getenv("NEWS_MCP_HEALTH_CHECK_INTERVAL", "30"))
+
+# Where conversation threads are kept: "memory" or "sqlite" (requires langgraph-checkpoint-sqlite).
+# In memory, only the latest checkpoint of each thread is kept, and at most CHAT_MAX_THREADS
+# threads: the least recently used one is deleted when a new thread would exceed it (0 = no limit)
+CHAT_CHECKPOINTER = os.getenv("CHAT_CHECKPOINTER", "memory")
+CHAT_CHECKPOINT_DB = os.getenv("CHAT_CHECKPOINT_DB", "chat_threads.sqlite")
+CHAT_MAX_THREADS = int(os.getenv("CHAT_MAX_THREADS", "1000"))
+
+# Token budget for a thread's history, the size earlier tool results are truncated to,
+# and whether turns dropped from the history are summarized by the LLM
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "8000"))
+CHAT_HISTORY_TOOL_RESULT_TOKENS = int(os.getenv("CHAT_HISTORY_TOOL_RESULT_TOKENS", "1000"))
+CHAT_HISTORY_SUMMARIZE = os.getenv("CHAT_HISTORY_SUMMARIZE", "false").lower() == "true"
+
+# Approximate token caps for each tool result and for all tool results of a turn (0 = no cap)
+CHAT_CONTEXT_RESULT_TOKENS = int(os.getenv("CHAT_CONTEXT_RESULT_TOKENS", "2000"))
+CHAT_CONTEXT_TURN_TOKENS = int(os.getenv("CHAT_CONTEXT_TURN_TOKENS", "6000"))
+
+
+def get_news_server_connection() -> dict:
+    if NEWS_MCP_URL:
+        return {"url": NEWS_MCP_URL, "transport": "streamable_http"}
+
     # Get absolute path to the news server script
     project_root = os.path.dirname(os.path.abspath(__file__))
     news_server_path = os.path.join(project_root, "mcp-servers/news-server.py")
-    
-    client = MultiServerMCPClient(
-        {
-            "news": {
-                "command": "python",
-                "args": [news_server_path],
-                "transport": "stdio",
-                "env": os.environ.copy(),
-            }
-        }
+
+    return {
+        "command": "python",
+        "args": [news_server_path],
+        "transport": "stdio",
+        "env": os.environ.copy(),
+    }
+
+
+# Initialize LangGraph
+async def get_news_tools():
+    global news_sessions
+
+    # Tools call the news server over long-lived sessions instead of opening one per call
+    client = MultiServerMCPClient({"news": get_news_server_connection()})
+    news_sessions = SessionPool(
+        client,
+        "news",
+        size=NEWS_MCP_SESSIONS,
+        health_check_interval=NEWS_MCP_HEALTH_CHECK_INTERVAL,
     )
-    return await client.get_tools()
+    await news_sessions.start()
+    return await load_mcp_tools(news_sessions)
+
+
+async def close_news_tools():
+    global news_sessions
+    if news_sessions is not None:
+        await news_sessions.stop()
+        news_sessions = None
 
 
 # Global variables for tools and graph
+news_sessions = None
+checkpointer_stack = None
 news_tools = None
 all_tools = None
 graph = None
@@ -56,7 +114,7 @@ llm = get_default_chat_llm()
 
 # Initialize async components
 async def initialize_app():
-    global news_tools, all_tools, graph, llm_with_tools
+    global news_tools, all_tools, graph, llm_with_tools, checkpointer_stack
 
     # Load news tools from MCP server
     news_tools = await get_news_tools()
@@ -65,28 +123,69 @@ async def initialize_app():
     # Bind tools to LLM
     llm_with_tools = llm.bind_tools(all_tools)
 
-    # System message
-    sys_msg = SystemMessage(
-        content="You are a helpful assistant with access to news tools. You can help users search for and analyze news content."
+    # Conversation threads are checkpointed so follow-up questions see earlier turns
+    checkpointer_stack = AsyncExitStack()
+    checkpointer = await open_checkpointer(
+        checkpointer_stack, CHAT_CHECKPOINTER, CHAT_CHECKPOINT_DB, CHAT_MAX_THREADS
+    )
+    history = HistoryManager(
+        token_budget=CHAT_HISTORY_TOKEN_BUDGET,
+        tool_result_tokens=CHAT_HISTORY_TOOL_RESULT_TOKENS,
+        summary_llm=llm if CHAT_HISTORY_SUMMARIZE else None,
+    )
+    # Tool results are reduced to the context budget before the LLM sees them
+    budget = ContextBudget(
+        result_tokens=CHAT_CONTEXT_RESULT_TOKENS, turn_tokens=CHAT_CONTEXT_TURN_TOKENS
     )
 
-    # Node
-    def assistant(state: MessagesState):
-        return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+    # System message
+    system_prompt = "You are a helpful assistant with access to news tools. You can help users search for and analyze news content."
+
+    # Node - async so a slow LLM response doesn't block the event loop for other requests
+    async def assistant(state: ChatState):
+        content = system_prompt
+        if state.get("summary"):
+            content += f"\n\nSummary of the earlier conversation:\n{state['summary']}"
+        sys_msg = SystemMessage(content=content)
+        return {"messages": [await llm_with_tools.ainvoke([sys_msg] + state["messages"])]}
 
     # Build graph
-    builder = StateGraph(MessagesState)
+    builder = StateGraph(ChatState)
+    builder.add_node("history", history.compact)
     builder.add_node("assistant", assistant)
     builder.add_node("tools", ToolNode(all_tools))
-    builder.add_edge(START, "assistant")
+    builder.add_node("budget", budget.reduce)
+    builder.add_edge(START, "history")
+    builder.add_edge("history", "assistant")
     builder.add_conditional_edges(
         "assistant",
         tools_condition,
     )
-    builder.add_edge("tools", "assistant")
+    builder.add_edge("tools", "budget")
+    builder.add_edge("budget", "assistant")
 
     # Compile graph
-    graph = builder.compile()
+    graph = builder.compile(checkpointer=checkpointer)
+
+
+async def close_app():
+    global checkpointer_stack
+    await close_news_tools()
+    if checkpointer_stack is not None:
+        await checkpointer_stack.aclose()
+        checkpointer_stack = None
+
+
+def thread_config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def current_turn(messages: list) -> list:
+    """Messages of the latest turn, from the last user message on"""
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return messages[i:]
+    return messages
 
 
 # Lifespan event handler
@@ -95,7 +194,8 @@ async def lifespan(app: FastAPI):
     # Startup
     await initialize_app()
     yield
-    # Shutdown (nothing to cleanup for now)
+    # Shutdown
+    await close_app()
 
 
 # Create FastAPI instance with lifespan
@@ -105,7 +205,11 @@ app = FastAPI(title="LangGraph Chat Interface", lifespan=lifespan)
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "Chat service is running"}
+    return {
+        "status": "healthy",
+        "message": "Chat service is running",
+        "news_mcp_sessions": news_sessions.info() if news_sessions else [],
+    }
 
 
 # Agent details endpoint
@@ -142,7 +246,7 @@ async def get_agent_info():
             }
         },
         "tools": tools_info,
-        "graph_nodes": ["assistant", "tools"],
+        "graph_nodes": ["history", "assistant", "tools", "budget"],
     }
 
 
@@ -155,19 +259,21 @@ async def chat_endpoint(chat_message: ChatMessage):
         )
 
     try:
-        # Create initial state with user message
+        # Add the user message to the thread's checkpointed state
+        thread_id = chat_message.thread_id or str(uuid.uuid4())
         initial_state = {"messages": [HumanMessage(content=chat_message.message)]}
 
         # Run the graph
-        result = await graph.ainvoke(initial_state)
+        result = await graph.ainvoke(initial_state, thread_config(thread_id))
 
         # Extract the final response
         final_message = result["messages"][-1]
         response_content = final_message.content
 
-        # Extract tool calls if any
+        # Extract tool calls of this turn if any
+        turn = current_turn(result["messages"])
         tool_calls = []
-        for message in result["messages"]:
+        for message in turn:
             if hasattr(message, "tool_calls") and message.tool_calls:
                 for tool_call in message.tool_calls:
                     tool_calls.append(
@@ -178,7 +284,12 @@ async def chat_endpoint(chat_message: ChatMessage):
                         }
                     )
 
-        return ChatResponse(response=response_content, tool_calls=tool_calls)
+        return ChatResponse(
+            response=response_content,
+            thread_id=thread_id,
+            tool_calls=tool_calls,
+            tokens_saved=tokens_saved(turn),
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
@@ -198,12 +309,16 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.close()
         return
 
+    # Messages on a connection continue one thread unless the client names another
+    connection_thread_id = str(uuid.uuid4())
+
     try:
         while True:
             # Receive message from client
             data = await websocket.receive_text()
             message_data = json.loads(data)
             user_message = message_data.get("message", "")
+            thread_id = message_data.get("thread_id") or connection_thread_id
 
             if not user_message:
                 await websocket.send_text(
@@ -230,9 +345,26 @@ async def websocket_endpoint(websocket: WebSocket):
                 tool_calls = []
                 final_response = ""
                 step_counter = 0
+                turn_tokens_saved = 0
+
+                async for mode, chunk in graph.astream(
+                    initial_state,
+                    thread_config(thread_id),
+                    stream_mode=["messages", "updates"],
+                ):
+                    if mode == "messages":
+                        # Forward LLM tokens as they are generated
+                        message_chunk, metadata = chunk
+                        token = message_text(message_chunk)
+                        if token and metadata.get("langgraph_node") == "assistant":
+                            await websocket.send_text(
+                                json.dumps({"type": "token", "content": token})
+                            )
+                        continue
 
-                async for chunk in graph.astream(initial_state):
                     for node_name, node_output in chunk.items():
+                        if node_name == "history":
+                            continue
                         step_counter += 1
 
                         if node_name == "assistant":
@@ -349,6 +481,28 @@ async def websocket_endpoint(websocket: WebSocket):
                                             )
                                         )
 
+                        elif node_name == "budget" and node_output:
+                            # Tool results were reduced to the context budget
+                            saved = tokens_saved(node_output.get("messages", []))
+                            turn_tokens_saved += saved
+                            step_counter += 1
+                            budget_step = {
+                                "step": step_counter,
+                                "type": "context_budget",
+                                "content": f"Reduced tool results by ~{saved} tokens",
+                            }
+                            reasoning_steps.append(budget_step)
+
+                            # Send real-time update
+                            await websocket.send_text(
+                                json.dumps(
+                                    {
+                                        "type": "reasoning_step",
+                                        "step": budget_step,
+                                    }
+                                )
+                            )
+
                 # Send final complete response
                 await websocket.send_text(
                     json.dumps(
@@ -357,6 +511,8 @@ async def websocket_endpoint(websocket: WebSocket):
                             or "I apologize, but I wasn't able to generate a response.",
                             "reasoning_steps": reasoning_steps,
                             "tool_calls": tool_calls,
+                            "thread_id": thread_id,
+                            "tokens_saved": turn_tokens_saved,
                             "type": "final_complete",
                         }
                     )
@@ -606,6 +762,9 @@ async def chat_ui():
                     thinkingDiv.id = 'current-thinking';
                     messagesDiv.appendChild(thinkingDiv);
                     messagesDiv.scrollTop = messagesDiv.scrollHeight;
+                } else if (data.type === 'token') {
+                    // Render the answer progressively as tokens arrive
+                    appendToken(data.content);
                 } else if (data.type === 'reasoning_step') {
                     // Add or update reasoning steps in real-time
                     handleReasoningStep(data.step);
@@ -640,6 +799,8 @@ async def chat_ui():
             let currentReasoningContainer = null;
             let currentReasoningContent = null;
             let currentMessageDiv = null;
+            let currentResponseDiv = null;
+            let streamedText = '';
 
             function addAgentInfoMessage(agentData) {
                 const infoDiv = document.createElement('div');
@@ -725,6 +886,8 @@ async def chat_ui():
                 currentReasoningContainer = null;
                 currentReasoningContent = null;
                 currentMessageDiv = null;
+                currentResponseDiv = null;
+                streamedText = '';
                 
                 // Remove any leftover thinking messages
                 const thinkingMsg = document.getElementById('current-thinking');
@@ -733,18 +896,64 @@ async def chat_ui():
                 }
             }
 
+            function ensureMessageDiv() {
+                // Remove thinking message
+                const thinkingMsg = document.getElementById('current-thinking');
+                if (thinkingMsg) {
+                    thinkingMsg.remove();
+                }
+                
+                if (!currentMessageDiv) {
+                    currentMessageDiv = document.createElement('div');
+                    currentMessageDiv.className = 'message bot-message';
+                    messagesDiv.appendChild(currentMessageDiv);
+                }
+            }
+
+            function createResponseDiv() {
+                const responseDiv = document.createElement('div');
+                responseDiv.className = 'final-response-text';
+                responseDiv.style.marginTop = '10px';
+                responseDiv.style.fontWeight = 'normal';
+                responseDiv.style.padding = '15px';
+                responseDiv.style.backgroundColor = '#f8f9fa';
+                responseDiv.style.borderRadius = '8px';
+                responseDiv.style.border = '1px solid #dee2e6';
+                responseDiv.style.lineHeight = '1.6';
+                return responseDiv;
+            }
+
+            function appendToken(token) {
+                ensureMessageDiv();
+                
+                if (!currentResponseDiv) {
+                    // Response text goes below the reasoning container
+                    currentResponseDiv = createResponseDiv();
+                    currentMessageDiv.appendChild(currentResponseDiv);
+                }
+                
+                streamedText += token;
+                currentResponseDiv.innerHTML = convertMarkdownToHtml(streamedText);
+                messagesDiv.scrollTop = messagesDiv.scrollHeight;
+            }
+
+            function discardStreamedText() {
+                // Text streamed before a tool call isn't the final answer
+                if (currentResponseDiv) {
+                    currentResponseDiv.remove();
+                    currentResponseDiv = null;
+                }
+                streamedText = '';
+            }
+
             function handleReasoningStep(step) {
+                if (step.type === 'reasoning') {
+                    discardStreamedText();
+                }
+                
                 // Initialize reasoning container if needed
                 if (!currentReasoningContainer) {
-                    // Remove thinking message
-                    const thinkingMsg = document.getElementById('current-thinking');
-                    if (thinkingMsg) {
-                        thinkingMsg.remove();
-                    }
-                    
-                    // Create main message div
-                    currentMessageDiv = document.createElement('div');
-                    currentMessageDiv.className = 'message bot-message';
+                    ensureMessageDiv();
                     
                     // Create reasoning container
                     currentReasoningContainer = document.createElement('div');
@@ -763,8 +972,7 @@ async def chat_ui():
                     
                     currentReasoningContainer.appendChild(reasoningHeader);
                     currentReasoningContainer.appendChild(currentReasoningContent);
-                    currentMessageDiv.appendChild(currentReasoningContainer);
-                    messagesDiv.appendChild(currentMessageDiv);
+                    currentMessageDiv.prepend(currentReasoningContainer);
                 }
                 
                 // Add the new step
@@ -780,6 +988,7 @@ async def chat_ui():
                     case 'tool_call': icon = '🔧'; break;
                     case 'tool_response': icon = '📋'; break;
                     case 'final_response': icon = '💬'; break;
+                    case 'context_budget': icon = '✂️'; break;
                 }
                 
                 stepHeader.textContent = `${icon} Step ${step.step}: ${step.content}`;
@@ -821,36 +1030,18 @@ async def chat_ui():
             function completeFinalMessage(data) {
                 console.log("completeFinalMessage called with:", data);
                 
-                // Remove any leftover thinking message
-                const thinkingMsg = document.getElementById('current-thinking');
-                if (thinkingMsg) {
-                    thinkingMsg.remove();
-                }
-                
-                if (!currentMessageDiv) {
-                    // If no reasoning steps, create a simple message
-                    currentMessageDiv = document.createElement('div');
-                    currentMessageDiv.className = 'message bot-message';
-                    messagesDiv.appendChild(currentMessageDiv);
-                }
+                // Remove any leftover thinking message, creating a simple message if there were no steps
+                ensureMessageDiv();
                 
                 if (data.response && data.response.trim()) {
-                    // Add the final response below the reasoning container
-                    const responseDiv = document.createElement('div');
-                    responseDiv.className = 'final-response-text';
-                    responseDiv.style.marginTop = '10px';
-                    responseDiv.style.fontWeight = 'normal';
-                    responseDiv.style.padding = '15px';
-                    responseDiv.style.backgroundColor = '#f8f9fa';
-                    responseDiv.style.borderRadius = '8px';
-                    responseDiv.style.border = '1px solid #dee2e6';
-                    responseDiv.style.lineHeight = '1.6';
+                    // Replace the streamed text with the complete response, or add it below the reasoning container
+                    if (!currentResponseDiv) {
+                        currentResponseDiv = createResponseDiv();
+                        currentMessageDiv.appendChild(currentResponseDiv);
+                    }
                     
                     // Convert markdown to HTML
-                    responseDiv.innerHTML = convertMarkdownToHtml(data.response);
-                    
-                    // Add at the end of the message (below reasoning)
-                    currentMessageDiv.appendChild(responseDiv);
+                    currentResponseDiv.innerHTML = convertMarkdownToHtml(data.response);
                 } else {
                     // Fallback if no response
                     const errorDiv = document.createElement('div');
@@ -920,6 +1111,7 @@ async def chat_ui():
                             case 'tool_call': icon = '🔧'; break;
                             case 'tool_response': icon = '📋'; break;
                             case 'final_response': icon = '💬'; break;
+                            case 'context_budget': icon = '✂️'; break;
                         }
                         
                         stepHeader.textContent = `${icon} Step ${step.step}: ${step.content}`;
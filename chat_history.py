@@ -0,0 +1,244 @@
+"""
+Conversation history policy for chat threads.
+
+Threads are persisted by a LangGraph checkpointer, so every turn is sent to the LLM with
+the whole conversation so far. HistoryManager runs at the start of each turn and keeps
+that history within a token budget: large tool results from earlier turns are truncated,
+then the oldest turns are dropped, optionally folding them into a running summary.
+"""
+
+import logging
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Any, Optional
+
+from langchain_core.messages import (
+    AnyMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import MessagesState
+
+logger = logging.getLogger(__name__)
+
+# count_tokens_approximately assumes about 4 characters per token
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the earlier part of a conversation between a user and a news assistant. "
+    "Keep the facts, story IDs, headlines, dates and open questions the assistant may "
+    "need to answer follow-up questions, and leave out pleasantries. "
+    "Reply with the summary only."
+)
+
+
+class ChatState(MessagesState):
+    # Summary of turns dropped from the history
+    summary: str
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer that keeps only the latest checkpoint of each thread, and at most
+    max_threads threads. The least recently used thread is deleted to make room for a new one,
+    so memory stays bounded however many threads are started. 0 keeps every thread.
+    """
+
+    def __init__(self, max_threads: int = 1000):
+        super().__init__()
+        self.max_threads = max_threads
+        self._threads: OrderedDict[str, None] = OrderedDict()
+        # Latest checkpoint ID and channel versions per thread and checkpoint namespace
+        self._latest: dict[str, dict[str, tuple[str, dict]]] = {}
+
+    def _touch(self, thread_id: str):
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+        while self.max_threads > 0 and len(self._threads) > self.max_threads:
+            evicted, _ = self._threads.popitem(last=False)
+            self.delete_thread(evicted)
+            logger.debug(f"Evicted chat thread {evicted}")
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self._threads:
+            self._threads.move_to_end(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = saved["configurable"]["thread_id"]
+        checkpoint_ns = saved["configurable"]["checkpoint_ns"]
+        latest = self._latest.setdefault(thread_id, {})
+        previous_id, versions = latest.get(checkpoint_ns, (None, {}))
+        # Drop the thread's previous checkpoint, its pending writes and replaced channel values
+        if previous_id is not None and previous_id != checkpoint["id"]:
+            self.storage[thread_id][checkpoint_ns].pop(previous_id, None)
+            self.writes.pop((thread_id, checkpoint_ns, previous_id), None)
+        for channel, version in new_versions.items():
+            if versions.get(channel, version) != version:
+                self.blobs.pop((thread_id, checkpoint_ns, channel, versions[channel]), None)
+            versions[channel] = version
+        latest[checkpoint_ns] = (checkpoint["id"], versions)
+        self._touch(thread_id)
+        return saved
+
+    def delete_thread(self, thread_id: str):
+        self._threads.pop(thread_id, None)
+        latest = self._latest.pop(thread_id, None)
+        if latest is None:
+            super().delete_thread(thread_id)
+            return
+        # Only the latest checkpoint is stored, so its keys are known without a scan
+        self.storage.pop(thread_id, None)
+        for checkpoint_ns, (checkpoint_id, versions) in latest.items():
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            for channel, version in versions.items():
+                self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+
+
+async def open_checkpointer(
+    stack: AsyncExitStack,
+    kind: str = "memory",
+    path: str = "chat_threads.sqlite",
+    max_threads: int = 1000,
+) -> BaseCheckpointSaver:
+    """
+    Open the checkpointer that persists chat threads, closed when the stack is. Threads kept
+    in memory are limited to max_threads (see BoundedMemorySaver).
+    """
+    if kind == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            logger.warning(
+                "CHAT_CHECKPOINTER is sqlite but langgraph-checkpoint-sqlite is not installed, "
+                "keeping threads in memory"
+            )
+        else:
+            return await stack.enter_async_context(AsyncSqliteSaver.from_conn_string(path))
+    elif kind != "memory":
+        logger.warning(f"Unknown CHAT_CHECKPOINTER '{kind}', keeping threads in memory")
+    return BoundedMemorySaver(max_threads)
+
+
+def message_text(message: Any) -> str:
+    """Text of a message or message chunk, whose content may be a list of content blocks"""
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content
+        if not isinstance(block, dict) or block.get("type") == "text"
+    )
+
+
+def _split_turns(messages: list[AnyMessage]) -> list[list[AnyMessage]]:
+    """Group messages into turns, each starting at a user message"""
+    turns: list[list[AnyMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class HistoryManager:
+    """
+    Keep a thread's history within token_budget tokens.
+
+    Tool results of earlier turns longer than tool_result_tokens are truncated. If the
+    history is still over budget the oldest turns are removed, never the current one.
+    With a summary_llm, removed turns are summarized into the state's summary instead of
+    being forgotten.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 8000,
+        tool_result_tokens: int = 1000,
+        summary_llm: Optional[Any] = None,
+    ):
+        self.token_budget = token_budget
+        self.tool_result_tokens = tool_result_tokens
+        self.summary_llm = summary_llm
+
+    def _truncate(self, message: ToolMessage) -> Optional[ToolMessage]:
+        # Results truncated on an earlier turn are left as they are
+        if self.tool_result_tokens <= 0 or "history_truncated" in message.response_metadata:
+            return None
+        text = message_text(message)
+        keep = self.tool_result_tokens * CHARS_PER_TOKEN
+        if len(text) <= keep:
+            return None
+        content = f"{text[:keep]}\n[... {len(text) - keep} characters of an earlier tool result removed]"
+        # Same ID, so the checkpointed message is replaced
+        return message.model_copy(
+            update={
+                "content": content,
+                "response_metadata": {**message.response_metadata, "history_truncated": len(text)},
+            }
+        )
+
+    async def compact(self, state: ChatState) -> dict:
+        """Graph node returning the state updates that bring the history within budget"""
+        messages = state["messages"]
+        summary = state.get("summary", "")
+
+        current = max(
+            (i for i, message in enumerate(messages) if isinstance(message, HumanMessage)),
+            default=0,
+        )
+        earlier, current_turn = messages[:current], messages[current:]
+
+        replaced = {}
+        for i, message in enumerate(earlier):
+            if isinstance(message, ToolMessage):
+                truncated = self._truncate(message)
+                if truncated is not None:
+                    replaced[message.id] = truncated
+                    earlier[i] = truncated
+
+        dropped: list[AnyMessage] = []
+        if self.token_budget > 0:
+            turns = _split_turns(earlier)
+            total = count_tokens_approximately(earlier + current_turn)
+            if summary:
+                total += len(summary) // CHARS_PER_TOKEN
+            while turns and total > self.token_budget:
+                turn = turns.pop(0)
+                dropped.extend(turn)
+                total -= count_tokens_approximately(turn)
+
+        updates: dict = {}
+        dropped_ids = {message.id for message in dropped}
+        update_messages = [m for id_, m in replaced.items() if id_ not in dropped_ids]
+        update_messages += [RemoveMessage(id=message.id) for message in dropped]
+        if update_messages:
+            updates["messages"] = update_messages
+        if dropped:
+            logger.info(
+                f"Dropped {len(dropped)} messages and truncated {len(replaced)} tool results from thread history"
+            )
+            if self.summary_llm is not None:
+                updates["summary"] = await self._summarize(summary, dropped)
+        return updates
+
+    async def _summarize(self, summary: str, dropped: list[AnyMessage]) -> str:
+        transcript = "\n".join(f"{message.type}: {message_text(message)}" for message in dropped)
+        if summary:
+            transcript = f"Summary so far: {summary}\n\n{transcript}"
+        try:
+            response = await self.summary_llm.ainvoke(
+                [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=transcript)]
+            )
+        except Exception as e:
+            logger.warning(f"Summarizing thread history failed, dropping it instead: {e}")
+            return summary
+        return message_text(response)
@@ -0,0 +1,249 @@
+"""
+Token budget for tool results fed back to the LLM.
+
+Stories come back from get_news_story with their full HTML body, so a few fetches can
+dominate the prompt. ContextBudget runs between the tools node and the assistant node and
+reduces each new tool result deterministically: HTML is converted to text, wire-service
+boilerplate is stripped, bodies still over budget are cut to their lead paragraphs, and
+results that are still too long, like long headline lists, lose their trailing list items.
+Results are held to a per-result cap and, together with earlier results of the same
+turn, to a per-turn cap.
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+from typing import Any, Optional
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from chat_history import CHARS_PER_TOKEN, message_text
+
+# Story HTML is converted to text the same way the news server does it
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp-servers"))
+from news_format import html_to_text  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# A result is never cut below this, even when the turn's budget is used up,
+# and a story body within a result not below MIN_CONTENT_TOKENS
+MIN_RESULT_TOKENS = 100
+MIN_CONTENT_TOKENS = 25
+
+# Lines that carry no news: bylines, desk contacts, trust principles, copyright and links
+_BOILERPLATE = re.compile(
+    r"""^\s*(
+        \(?\s*(reporting|writing|editing|additional\ reporting|compiled)\ by\b.*
+      | \(\(.*\)\)
+      | .*\b(our\ standards|trust\ principles)\b.*
+      | (©|\(c\)|copyright)\s.*
+      | keywords?:.*
+      | (click|tap)\ here\b.*
+      | (for\ (more|related)\ .*:|see\ also:)\s*
+      | (https?://|www\.)\S+
+    )\s*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def strip_boilerplate(text: str) -> str:
+    return "\n".join(line for line in text.splitlines() if not _BOILERPLATE.match(line))
+
+
+def lead(text: str, max_tokens: int) -> str:
+    """The leading paragraphs of text that fit in max_tokens, cut at a sentence if need be"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    kept = ""
+    for paragraph in text.split("\n"):
+        candidate = f"{kept}\n{paragraph}" if kept else paragraph
+        if len(candidate) > max_chars:
+            break
+        kept = candidate
+    if not kept:
+        # The first paragraph alone is too long, keep its leading sentences
+        cut = text[:max_chars]
+        sentence_end = max(cut.rfind(". "), cut.rfind("? "), cut.rfind("! "))
+        kept = cut[: sentence_end + 1] if sentence_end > 0 else cut
+    return f"{kept}\n[... {len(text) - len(kept)} more characters]"
+
+
+def _content_fields(value: Any) -> list[tuple[Any, Any]]:
+    """(container, key) of every "content" string in a decoded tool result"""
+    found = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "content" and isinstance(item, str):
+                found.append((value, key))
+            else:
+                found.extend(_content_fields(item))
+    elif isinstance(value, list):
+        for item in value:
+            found.extend(_content_fields(item))
+    return found
+
+
+def _largest_list(value: Any, parent: Any = None, key: Any = None) -> Optional[tuple[Any, Any, list]]:
+    """(parent, key, list) of the list with the longest JSON among those with over one item"""
+    candidates = []
+    if isinstance(value, list):
+        if len(value) > 1:
+            candidates.append((parent, key, value))
+        items = enumerate(value)
+    elif isinstance(value, dict):
+        items = value.items()
+    else:
+        return None
+    for item_key, item in items:
+        found = _largest_list(item, value, item_key)
+        if found is not None:
+            candidates.append(found)
+    return max(candidates, key=lambda found: len(json.dumps(found[2], ensure_ascii=False)), default=None)
+
+
+def _drop_trailing_items(data: Any, excess: int) -> bool:
+    """
+    Drop trailing items of the largest list worth about excess tokens, keeping at least one.
+    How many were dropped is recorded next to the list, as "<key>_omitted" in its object or
+    as a final {"omitted": n} item. A next_cursor in that object would continue after the
+    dropped items, so it is removed. Returns False when there is no list left to shorten.
+    """
+    found = _largest_list(data)
+    if found is None:
+        return False
+    parent, key, items = found
+    omitted = 0
+    if isinstance(items[-1], dict) and set(items[-1]) == {"omitted"}:
+        omitted = items.pop()["omitted"]
+        if len(items) == 1:
+            items.append({"omitted": omitted})
+            return False
+    dropped = 0
+    while len(items) > 1 and dropped < excess:
+        dropped += estimate_tokens(json.dumps(items.pop(), ensure_ascii=False)) + 1
+        omitted += 1
+    if isinstance(parent, dict):
+        parent[f"{key}_omitted"] = parent.get(f"{key}_omitted", 0) + omitted
+        if parent.get("next_cursor"):
+            parent["next_cursor"] = None
+            parent["next_cursor_note"] = (
+                f"Removed as {key} were omitted to fit the context, repeat the search with a smaller limit"
+            )
+    else:
+        items.append({"omitted": omitted})
+    return True
+
+
+def reduce_result(text: str, max_tokens: Optional[int] = None) -> str:
+    """Reduce a tool result to plain text, within max_tokens where possible"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+
+    if not isinstance(data, (dict, list)):
+        body = strip_boilerplate(html_to_text(text))
+        return lead(body, max_tokens) if max_tokens else body
+
+    fields = _content_fields(data)
+    for container, key in fields:
+        container[key] = strip_boilerplate(html_to_text(container[key]))
+
+    reduced = json.dumps(data, ensure_ascii=False)
+    excess = estimate_tokens(reduced) - max_tokens if max_tokens else 0
+    if excess > 0 and fields:
+        # Share what is left after the other fields between the story bodies
+        content_tokens = sum(estimate_tokens(container[key]) for container, key in fields)
+        per_field = max((content_tokens - excess) // len(fields), MIN_CONTENT_TOKENS)
+        for container, key in fields:
+            container[key] = lead(container[key], per_field)
+        reduced = json.dumps(data, ensure_ascii=False)
+
+    # Results without story bodies, e.g. long headline lists, are shortened instead
+    while max_tokens and estimate_tokens(reduced) > max_tokens:
+        if not _drop_trailing_items(data, estimate_tokens(reduced) - max_tokens):
+            break
+        reduced = json.dumps(data, ensure_ascii=False)
+    return reduced
+
+
+class ContextBudget:
+    """
+    Hold the tool results of a turn to result_tokens each and turn_tokens in total.
+
+    Reduced results replace the original ToolMessages (same ID) and record their token
+    counts before and after in response_metadata["context_budget"]. A cap of 0 is off.
+    """
+
+    def __init__(self, result_tokens: int = 2000, turn_tokens: int = 6000):
+        self.result_tokens = result_tokens
+        self.turn_tokens = turn_tokens
+
+    def _limit(self, messages: list, new_results: int) -> Optional[int]:
+        limit = self.result_tokens if self.result_tokens > 0 else None
+        if self.turn_tokens > 0:
+            used = 0
+            for message in reversed(messages):
+                if isinstance(message, HumanMessage):
+                    break
+                if isinstance(message, ToolMessage) and "context_budget" in message.response_metadata:
+                    used += message.response_metadata["context_budget"]["tokens_after"]
+            share = max((self.turn_tokens - used) // new_results, MIN_RESULT_TOKENS)
+            limit = share if limit is None else min(limit, share)
+        return limit
+
+    async def reduce(self, state: dict) -> dict:
+        """Graph node returning the reduced tool results of the latest tool round"""
+        messages = state["messages"]
+        start = len(messages)
+        while start > 0 and isinstance(messages[start - 1], ToolMessage):
+            start -= 1
+        new_results = [
+            message
+            for message in messages[start:]
+            if "context_budget" not in message.response_metadata
+        ]
+        if not new_results:
+            return {}
+
+        limit = self._limit(messages[:start], len(new_results))
+        reduced_messages = []
+        saved = 0
+        for message in new_results:
+            text = message_text(message)
+            reduced = text if message.status == "error" else reduce_result(text, limit)
+            before, after = estimate_tokens(text), estimate_tokens(reduced)
+            saved += before - after
+            reduced_messages.append(
+                message.model_copy(
+                    update={
+                        "content": reduced,
+                        "response_metadata": {
+                            **message.response_metadata,
+                            "context_budget": {"tokens_before": before, "tokens_after": after},
+                        },
+                    }
+                )
+            )
+
+        logger.info(f"Context budget saved {saved} tokens on {len(reduced_messages)} tool results")
+        return {"messages": reduced_messages}
+
+
+def tokens_saved(messages: list) -> int:
+    """Tokens saved by the context budget on the tool results among messages"""
+    saved = 0
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            budget = message.response_metadata.get("context_budget")
+            if budget:
+                saved += budget["tokens_before"] - budget["tokens_after"]
+    return saved
@@ -4,6 +4,7 @@ import os
 import sys
 import asyncio
 import logging
+import uuid
 from typing import List, Dict, Any
 
 from langsmith import testing as t
@@ -12,7 +13,7 @@ from langchain_core.messages import HumanMessage
 
 # Add parent directory to path to import chat_app and llm
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from chat_app import initialize_app
+from chat_app import initialize_app, close_app, thread_config
 from llm import get_default_judge_llm
 
 logging.basicConfig(level=logging.INFO)
@@ -42,7 +43,7 @@ async def run_agent_get_trajectory(question: str) -> List[Dict[str, Any]]:
         initial_state = {"messages": [HumanMessage(content=question)]}
 
         # Run the graph
-        result = await graph.ainvoke(initial_state)
+        result = await graph.ainvoke(initial_state, thread_config(str(uuid.uuid4())))
 
         # Convert LangChain messages to standard chat format
         trajectory = []
@@ -75,6 +76,9 @@ async def run_agent_get_trajectory(question: str) -> List[Dict[str, Any]]:
     except Exception as e:
         logger.error(f"Error running agent: {e}")
         return []
+    finally:
+        # Close the news server sessions and checkpointer opened by initialize_app on this event loop
+        await close_app()
 
 
 @pytest.mark.langsmith
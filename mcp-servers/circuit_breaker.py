@@ -0,0 +1,81 @@
+import time
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"{endpoint} is temporarily unavailable after repeated failures, retry in {retry_in:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After failure_threshold consecutive failed requests the circuit opens and requests
+    fail fast for reset_timeout seconds. It then lets a single trial request through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def before_request(self):
+        """Check the circuit before sending a request, raising CircuitOpenError while it is open"""
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.reset_timeout:
+                raise CircuitOpenError(self.endpoint, self.reset_timeout - elapsed)
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuit for {self.endpoint} half-open, sending trial request")
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.endpoint, self.reset_timeout)
+            self._trial_in_flight = True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.endpoint} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"Circuit for {self.endpoint} opened after {self.consecutive_failures} failures"
+                )
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self):
+        """Give up a request without recording an outcome (e.g. it was cancelled)"""
+        self._trial_in_flight = False
+
+    def info(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+        }
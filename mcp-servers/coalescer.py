@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight call between concurrent callers asking for the same key.
+
+    The first caller starts the call as a task; callers arriving while it runs await the
+    same task. Each caller awaits it through asyncio.shield, so cancelling one caller never
+    cancels the shared call while others still wait for it; it is only cancelled once every
+    caller has gone. Results are shared as-is, so they should be immutable (e.g. bytes or
+    str) for callers to get independent copies.
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.coalesced = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight request for {key}")
+
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters[task] == 1:
+                # Callers arriving before the task has finished cancelling start a new call
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+                task.cancel()
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        self._waiters.pop(task, None)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def info(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -1,21 +1,218 @@
-from typing import Any
-import json
+from typing import Any, AsyncIterator, Optional
+from contextlib import asynccontextmanager
+import argparse
+import asyncio
 import logging
+import os
+import tempfile
+import anyio
+import httpx
 from mcp.server.fastmcp import FastMCP
-from rdp_auth import make_authenticated_request
+import news_json
+from coalescer import RequestCoalescer
+from prefetcher import StoryPrefetcher
+from news_cache import StoryCache, TTLCache, normalize_query
+from news_index import NewsIndex, date_bound
+from news_format import (
+    check_output_options,
+    extract_headline,
+    extract_rics,
+    extract_story,
+    shape_headline,
+    shape_story,
+)
+from rdp_auth import (
+    close_http_client,
+    get_circuit_breaker_info,
+    get_rate_limiter,
+    get_rate_limiter_info,
+    get_token_info,
+    make_authenticated_request,
+    start_token_refresher,
+    stop_token_refresher,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-logger.info("Starting news server")
+logger.info(f"Starting news server (JSON codec: {news_json.CODEC})")
 
-mcp = FastMCP("news")
+RDP_BASE_URL = os.getenv("RDP_BASE_URL", "https://api.refinitiv.com")
 
-RDP_BASE_URL = "https://api.refinitiv.com"
+# Refresh the RDP token in the background ahead of expiry instead of on the first request after it
+TOKEN_REFRESHER_ENABLED = os.getenv("RDP_TOKEN_REFRESHER", "false").lower() == "true"
 
+# Headline results are time-sensitive, so they are only cached briefly (seconds, 0 disables)
+headlines_cache = TTLCache(
+    max_entries=int(os.getenv("RDP_HEADLINES_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RDP_HEADLINES_CACHE_TTL", "60")),
+)
 
-@mcp.tool()
-async def get_headlines(user_query: str) -> str:
+# get_headlines paging: the API returns at most 100 headlines per page
+HEADLINES_PAGE_SIZE_MAX = 100
+HEADLINES_MAX_PAGES = int(os.getenv("RDP_HEADLINES_MAX_PAGES", "10"))
+
+# get_news_stories: stories fetched at once per call, and the most stories accepted per call
+BATCH_CONCURRENCY = int(os.getenv("RDP_BATCH_CONCURRENCY", "5"))
+BATCH_MAX_STORIES = int(os.getenv("RDP_BATCH_MAX_STORIES", "50"))
+
+# Background fetch of the top N stories of each headline search into the story cache (0 disables)
+PREFETCH_STORIES = int(os.getenv("RDP_PREFETCH_STORIES", "0"))
+PREFETCH_MAX_IN_FLIGHT = int(os.getenv("RDP_PREFETCH_MAX_IN_FLIGHT", "2"))
+
+# Largest response body accepted from the news API; bigger ones are aborted (0 disables)
+MAX_RESPONSE_BYTES = int(float(os.getenv("RDP_MAX_RESPONSE_MB", "25")) * 1024 * 1024)
+
+# Concurrent identical requests to the news API share one upstream call
+request_coalescer = RequestCoalescer()
+
+# Stories rarely change once published, so they are cached on disk across restarts (0 MB disables)
+story_cache = StoryCache(
+    os.getenv(
+        "RDP_STORY_CACHE_FILE",
+        os.path.join(tempfile.gettempdir(), "rdp_story_cache.sqlite3"),
+    ),
+    max_bytes=int(float(os.getenv("RDP_STORY_CACHE_MAX_MB", "100")) * 1024 * 1024),
+)
+
+# Fetched headlines and stories are indexed on disk for search_cached_news (0 items disables)
+news_index = NewsIndex(
+    os.getenv(
+        "RDP_NEWS_INDEX_FILE",
+        os.path.join(tempfile.gettempdir(), "rdp_news_index.sqlite3"),
+    ),
+    max_items=int(os.getenv("RDP_NEWS_INDEX_MAX_ITEMS", "100000")),
+)
+
+# Prefetching only pays off when the stories end up in the story cache
+story_prefetcher = StoryPrefetcher(
+    fetch=lambda story_id: _download_story(story_id),
+    is_cached=story_cache.contains,
+    is_saturated=lambda: _stories_limiter_saturated(),
+    top_n=PREFETCH_STORIES if story_cache.enabled else 0,
+    max_in_flight=PREFETCH_MAX_IN_FLIGHT,
+)
+
+
+async def startup():
+    if TOKEN_REFRESHER_ENABLED:
+        start_token_refresher()
+
+
+async def shutdown():
+    await stop_token_refresher()
+    await story_prefetcher.close()
+    await close_http_client()
+    story_cache.close()
+    news_index.close()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    # Runs once per MCP session, and HTTP transports serve many sessions from one process,
+    # so shared resources are only released when the whole server stops (see serve())
+    await startup()
+    yield
+
+
+# Tools return JSON text only: with structured output on, FastMCP would send each str result
+# a second time as {"result": "<the same JSON, escaped>"} in structuredContent
+mcp = FastMCP("news", lifespan=server_lifespan)
+
+
+def _stories_limiter_saturated() -> bool:
+    limiter = get_rate_limiter(f"{RDP_BASE_URL}/data/news/v1/stories")
+    return limiter is not None and limiter.saturated
+
+
+class ResponseTooLargeError(Exception):
+    pass
+
+
+def _check_response_size(url: str, size: int):
+    if MAX_RESPONSE_BYTES and size > MAX_RESPONSE_BYTES:
+        raise ResponseTooLargeError(
+            f"Response from {httpx.URL(url).path} is larger than {MAX_RESPONSE_BYTES // (1024 * 1024)} MB"
+        )
+
+
+async def _fetch_content(url: str, skip_binary: bool = False) -> bytes:
+    """
+    GET a news API URL and return the body, read as it streams in. Bodies over
+    MAX_RESPONSE_BYTES are aborted; with skip_binary, base64 media payloads are
+    left out as they arrive (see BinaryPayloadFilter).
+    """
+    response = await make_authenticated_request(url, stream=True, timeout=30.0)
+    try:
+        response.raise_for_status()
+        _check_response_size(url, int(response.headers.get("Content-Length", 0)))
+        body = news_json.BinaryPayloadFilter() if skip_binary else None
+        chunks = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            _check_response_size(url, received)
+            if body is not None:
+                body.feed(chunk)
+            else:
+                chunks.append(chunk)
+    finally:
+        await response.aclose()
+
+    if body is None:
+        return b"".join(chunks)
+    if body.skipped_bytes:
+        logger.info(f"Skipped {body.skipped_bytes} bytes of binary data from {httpx.URL(url).path}")
+    return body.getvalue()
+
+
+async def _fetch_json(url: str, params: Optional[dict] = None, skip_binary: bool = False) -> Any:
+    """
+    GET a news API URL and decode the JSON body. Concurrent requests for the same canonical
+    URL share one upstream request; each caller decodes its own copy of the body.
+    """
+    request_url = str(httpx.URL(url, params=sorted(params.items()) if params else None))
+    content = await request_coalescer.run(
+        request_url, lambda: _fetch_content(request_url, skip_binary)
+    )
+    return news_json.loads(content)
+
+
+async def _iter_headline_pages(
+    user_query: str, limit: Optional[int], cursor: Optional[str], max_pages: int
+) -> AsyncIterator[dict]:
+    """
+    Fetch headline pages one at a time, following the next-page cursor, so each page can be
+    processed and released before the next one is requested
+    """
+    search_url = f"{RDP_BASE_URL}/data/news/v1/headlines"
+    remaining = limit
+
+    for _ in range(max_pages):
+        params = {"cursor": cursor} if cursor else {"query": user_query}
+        if remaining is not None:
+            params["limit"] = min(remaining, HEADLINES_PAGE_SIZE_MAX)
+
+        page = await _fetch_json(search_url, params)
+        yield page
+
+        cursor = page.get("meta", {}).get("next")
+        if remaining is not None:
+            remaining -= len(page.get("data", []))
+            if remaining <= 0:
+                break
+        if not cursor:
+            break
+
+
+@mcp.tool(structured_output=False)
+async def get_headlines(
+    user_query: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    profile: str = "standard",
+) -> str:
     """
     Search for news articles using Refinitiv's advanced query syntax. Returns a simplified list of matching stories.
 
@@ -25,11 +222,27 @@ async def get_headlines(user_query: str) -> str:
 
     Args:
         user_query (str): Query string using News search syntax. Can be simple keywords or complex boolean expressions.
+        limit (int, optional): Maximum number of headlines to return. Use a small limit when a few headlines are enough,
+                               or a larger one to cover a longer period. Defaults to the news service's page size.
+        cursor (str, optional): The next_cursor from a previous get_headlines result, to continue that search where it
+                                stopped. When given, user_query is ignored.
+        max_pages (int, optional): Maximum number of result pages to fetch (each page holds up to 100 headlines).
+                                   Defaults to as many as limit needs.
+        profile (str, optional): Fields returned per headline: "minimal" (story_id and headline only),
+                                 "standard" (also publication_date) or "full" (also urgency, source and language).
+                                 Use "full" to filter by urgency or source, e.g. for the latest Reuters flashes,
+                                 without fetching each story. Defaults to "standard".
 
     Returns:
-        str: JSON array of simplified story objects containing:
-             - story_id: Unique identifier for the story (use this with get_news_story to get full details)
-             - headline: The headline/title of the news article
+        str: JSON object containing:
+             - headlines: Array of simplified story objects containing:
+                 - story_id: Unique identifier for the story (use this with get_news_story to get full details)
+                 - headline: The headline/title of the news article
+                 - publication_date: ISO timestamp of the story's latest version (standard and full profiles)
+                 - urgency: News urgency level, 1=flash, 3=regular story (full profile)
+                 - source: Information source code, e.g. NS:RTRS for Reuters (full profile)
+                 - language: Language code of the story, e.g. en (full profile)
+             - next_cursor: Pass as cursor to get the following headlines, or null when there are no more
 
     Example usage:
         Explicit FreeText (use quotes): Obtains headlines for stories having the text "electric car" or "electric vehicle" in their title.
@@ -62,38 +275,98 @@ async def get_headlines(user_query: str) -> str:
         user_query = '"Debt" and NOT CMPNY'
 
     """
-    search_url = f"{RDP_BASE_URL}/data/news/v1/headlines?query={user_query}"
-
+    if limit is not None and limit <= 0:
+        return "Error fetching news: limit must be a positive number"
     try:
-        response = await make_authenticated_request(search_url, timeout=30.0)
-        response.raise_for_status()
-        data = response.json()
+        check_output_options(profile, None)
+    except ValueError as e:
+        return f"Error fetching news: {e}"
+    if max_pages is None:
+        max_pages = -(-limit // HEADLINES_PAGE_SIZE_MAX) if limit else 1
+    max_pages = max(1, min(max_pages, HEADLINES_MAX_PAGES))
+
+    # Headlines are cached with all fields, so every profile shares one entry
+    cache_key = (cursor or normalize_query(user_query), limit, max_pages)
+    cached = headlines_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Headlines cache hit for {cache_key!r}")
+        return _headlines_result(*cached, profile)
 
-        # Extract simplified story data
+    try:
+        # Extract simplified story data page by page
         simplified_stories = []
-        if "data" in data:
-            for story in data["data"]:
-                story_data = {"story_id": story.get("storyId", ""), "headline": ""}
-
-                # Extract headline from nested structure
-                if (
-                    "newsItem" in story
-                    and "itemMeta" in story["newsItem"]
-                    and "title" in story["newsItem"]["itemMeta"]
-                ):
-                    titles = story["newsItem"]["itemMeta"]["title"]
-                    if titles and len(titles) > 0 and "$" in titles[0]:
-                        story_data["headline"] = titles[0]["$"]
+        story_rics = []
+        next_cursor = None
+        async for data in _iter_headline_pages(user_query, limit, cursor, max_pages):
+            next_cursor = data.get("meta", {}).get("next")
+            for story in data.get("data", []):
+                story_data = extract_headline(story)
+
+                # Drop cached copies of stories that have been updated since
+                story_cache.revalidate(story_data["story_id"], story_data["publication_date"] or None)
 
                 simplified_stories.append(story_data)
+                story_rics.append(extract_rics(story))
+
+        headlines_cache.set(cache_key, (simplified_stories, next_cursor))
+        news_index.add_headlines(simplified_stories, story_rics)
 
-        return json.dumps(simplified_stories)
+        # The agent usually reads the top stories next, so fetch them ahead of time
+        story_prefetcher.schedule([story["story_id"] for story in simplified_stories])
+        return _headlines_result(simplified_stories, next_cursor, profile)
     except Exception as e:
         return f"Error fetching news: {e}"
 
 
-@mcp.tool()
-async def get_news_story(storyId: str) -> str:
+def _headlines_result(headlines: list[dict], next_cursor: Optional[str], profile: str) -> str:
+    return news_json.dumps(
+        {
+            "headlines": [shape_headline(headline, profile) for headline in headlines],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+async def _fetch_story(storyId: str) -> str:
+    """Get the simplified story JSON from the story cache or the news API, raising on errors"""
+    story_prefetcher.record_request(storyId)
+    cached = story_cache.get(storyId)
+    if cached is not None:
+        logger.info(f"Story cache hit for {storyId}")
+        return cached
+
+    # Tool calls are queueing for the rate limiter, so stop prefetches competing with them
+    if _stories_limiter_saturated():
+        story_prefetcher.cancel_all()
+
+    return await _download_story(storyId)
+
+
+async def _download_story(storyId: str) -> str:
+    """Fetch a story from the news API, simplify it and store it in the story cache"""
+    news_url = f"{RDP_BASE_URL}/data/news/v1/stories/{storyId}"
+
+    # Image stories carry the image as base64, which extract_story leaves out anyway
+    data = await _fetch_json(news_url, skip_binary=True)
+
+    simplified_story = extract_story(storyId, data)
+    result = news_json.dumps(simplified_story)
+    story_cache.set(storyId, simplified_story["publication_date"] or None, result)
+    news_index.add_story(simplified_story, extract_rics(data))
+    return result
+
+
+def _story_result(story: str, profile: str, max_chars: Optional[int]) -> str:
+    if profile == "full" and max_chars is None:
+        # Already serialized in the story cache's format
+        return story
+    return news_json.dumps(shape_story(news_json.loads(story), profile, max_chars))
+
+
+@mcp.tool(structured_output=False)
+async def get_news_story(
+    storyId: str, profile: str = "standard", max_chars: Optional[int] = None
+) -> str:
     """
     Retrieve detailed information about a specific news story using its unique identifier.
 
@@ -105,9 +378,14 @@ async def get_news_story(storyId: str) -> str:
                       Format: 'urn:newsml:reuters.com:YYYY-MM-DD:nXXXXXXXX'
                       Example: 'urn:newsml:reuters.com:20250610:nL1N3SE0D8'
                       (Get this from the story_id field returned by query_news)
+        profile (str, optional): How much of the story to return. "minimal": story_id, headline, publication_date and
+                                 source only. "standard": all fields, with the content as plain text. "full": all fields,
+                                 with the content as published (usually HTML). Defaults to "standard".
+        max_chars (int, optional): Return at most this many characters of the content, e.g. 500 for the lead of the
+                                   story. Defaults to the whole content.
 
     Returns:
-        str: JSON object containing detailed story information:
+        str: JSON object containing detailed story information (fields depend on the profile):
              - story_id: The unique identifier
              - headline: Full headline/title of the article
              - publication_date: ISO timestamp when the story was published
@@ -122,71 +400,152 @@ async def get_news_story(storyId: str) -> str:
 
     Note: Some stories may be images, videos, or other media formats rather than text articles.
     """
-    news_url = f"{RDP_BASE_URL}/data/news/v1/stories/{storyId}"
+    try:
+        check_output_options(profile, max_chars)
+        return _story_result(await _fetch_story(storyId), profile, max_chars)
+    except Exception as e:
+        return f"Error fetching news by ID: {e}"
 
+
+@mcp.tool(structured_output=False)
+async def get_news_stories(
+    story_ids: list[str], profile: str = "standard", max_chars: Optional[int] = None
+) -> str:
+    """
+    Retrieve several news stories in one call. Use this instead of calling get_news_story repeatedly
+    when you need the details of more than one story, e.g. to summarize the results of get_headlines.
+
+    Stories are fetched concurrently. A story that fails to load does not affect the others.
+
+    Args:
+        story_ids (list[str]): Story identifiers from the story_id field returned by get_headlines.
+                               Example: ['urn:newsml:reuters.com:20250610:nL1N3SE0D8', 'urn:newsml:reuters.com:20250610:nL4N3SE0AB']
+        profile (str, optional): How much of each story to return, as for get_news_story. Defaults to "standard".
+        max_chars (int, optional): Return at most this many characters of each story's content.
+
+    Returns:
+        str: JSON array with one object per requested story, in the same order as story_ids:
+             - story_id: The requested identifier
+             - status: "ok" or "error"
+             - story: The story details as returned by get_news_story (when status is "ok")
+             - error: What went wrong (when status is "error")
+    """
+    if len(story_ids) > BATCH_MAX_STORIES:
+        return f"Error fetching news stories: at most {BATCH_MAX_STORIES} story IDs per call, got {len(story_ids)}"
     try:
-        response = await make_authenticated_request(news_url, timeout=30.0)
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract simplified story information
-        simplified_story = {
-            "story_id": storyId,
-            "headline": "",
-            "publication_date": "",
-            "urgency": "",
-            "content_type": "",
-            "content": "",
-            "source": "",
-        }
+        check_output_options(profile, max_chars)
+    except ValueError as e:
+        return f"Error fetching news stories: {e}"
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch(story_id: str) -> dict:
+        async with semaphore:
+            try:
+                story = shape_story(news_json.loads(await _fetch_story(story_id)), profile, max_chars)
+                return {"story_id": story_id, "status": "ok", "story": story}
+            except Exception as e:
+                return {"story_id": story_id, "status": "error", "error": str(e)}
+
+    # Fetch repeated IDs only once
+    unique_ids = list(dict.fromkeys(story_ids))
+    results = dict(zip(unique_ids, await asyncio.gather(*map(fetch, unique_ids))))
+
+    return news_json.dumps([results[story_id] for story_id in story_ids])
+
+
+@mcp.tool(structured_output=False)
+async def search_cached_news(
+    query: str,
+    limit: int = 10,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> str:
+    """
+    Search the headlines and stories this server has already fetched, without calling the news service.
+    Answers in milliseconds and keeps working when the news service is unavailable, but only covers news
+    seen before through get_headlines, get_news_story or get_news_stories. Use it first when researching
+    a topic again, and get_headlines for the latest news or anything not found here.
 
-        if "newsItem" in data:
-            news_item = data["newsItem"]
-
-            # Extract headline
-            if "contentMeta" in news_item and "headline" in news_item["contentMeta"]:
-                headlines = news_item["contentMeta"]["headline"]
-                if headlines and len(headlines) > 0 and "$" in headlines[0]:
-                    simplified_story["headline"] = headlines[0]["$"]
-
-            # Extract publication date
-            if "itemMeta" in news_item and "versionCreated" in news_item["itemMeta"]:
-                simplified_story["publication_date"] = news_item["itemMeta"][
-                    "versionCreated"
-                ]["$"]
-
-            # Extract urgency
-            if "contentMeta" in news_item and "urgency" in news_item["contentMeta"]:
-                simplified_story["urgency"] = news_item["contentMeta"]["urgency"]["$"]
-
-            # Extract source
-            if "contentMeta" in news_item and "infoSource" in news_item["contentMeta"]:
-                sources = news_item["contentMeta"]["infoSource"]
-                if sources and len(sources) > 0:
-                    simplified_story["source"] = sources[0].get("_qcode", "")
-
-            # Check content type and extract relevant content
-            if "contentSet" in news_item:
-                content_set = news_item["contentSet"]
-                if "inlineData" in content_set:
-                    inline_data = content_set["inlineData"]
-                    if inline_data and len(inline_data) > 0:
-                        content_type = inline_data[0].get("_contenttype", "")
-                        simplified_story["content_type"] = content_type
-
-                        # For images, just note it's an image - don't include base64 data
-                        if "image" in content_type:
-                            simplified_story["content"] = (
-                                "Image content (binary data not included)"
-                            )
-                        else:
-                            # For text content, include the actual content
-                            simplified_story["content"] = inline_data[0].get("$", "")
-
-        return json.dumps(simplified_story)
+    Args:
+        query (str): Words, "quoted phrases" or RICs (e.g. MSFT.O) to look for in headlines, story text and the
+                     RICs of each story. All terms must match unless combined with OR; NOT excludes a term and
+                     a trailing * matches a prefix, e.g. 'Tesla (earnings OR deliveries) NOT recall'.
+        limit (int, optional): Maximum number of results, best matches first. Defaults to 10.
+        date_from (str, optional): Only news published on or after this date or time, e.g. 2025-06-01 or
+                                   2025-06-01T14:00:00Z (UTC).
+        date_to (str, optional): Only news published up to and including this date (or before this time).
+
+    Returns:
+        str: JSON object containing:
+             - results: Array of matches, ranked by relevance:
+                 - story_id: Unique identifier for the story (use with get_news_story for the full story)
+                 - headline: The headline/title of the news article
+                 - publication_date: ISO timestamp of the story's latest version
+                 - urgency: News urgency level, 1=flash, 3=regular story
+                 - source: Information source code, e.g. NS:RTRS for Reuters
+                 - rics: RICs of the companies and instruments the story is about
+                 - story_indexed: Whether the story text was searched, or only the headline
+                 - snippet: The matching passage, with surrounding text
+    """
+    if not news_index.enabled:
+        return "Error searching cached news: the news index is disabled"
+    if limit <= 0:
+        return "Error searching cached news: limit must be a positive number"
+    try:
+        since = date_bound(date_from) if date_from else None
+        until = date_bound(date_to, end=True) if date_to else None
+        results = news_index.search(query, limit, since, until)
+        return news_json.dumps({"results": results})
     except Exception as e:
-        return f"Error fetching news by ID: {e}"
+        return f"Error searching cached news: {e}"
+
+
+@mcp.resource("news://server-stats")
+def get_server_stats() -> str:
+    """Cache, rate limiter, circuit breaker and token state of the news server"""
+    return news_json.dumps(
+        {
+            "headlines_cache": headlines_cache.info(),
+            "story_cache": story_cache.info(),
+            "news_index": news_index.info(),
+            "story_prefetcher": story_prefetcher.info(),
+            "request_coalescer": request_coalescer.info(),
+            "rate_limiters": get_rate_limiter_info(),
+            "circuit_breakers": get_circuit_breaker_info(),
+            "token": get_token_info(),
+        }
+    )
+
+
+async def serve(transport: str):
+    """Run the server on the given transport, releasing shared resources when it stops"""
+    await startup()
+    try:
+        if transport == "stdio":
+            await mcp.run_stdio_async()
+        elif transport == "streamable-http":
+            await mcp.run_streamable_http_async()
+        else:
+            await mcp.run_sse_async()
+    finally:
+        await shutdown()
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    parser = argparse.ArgumentParser(description="News MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http", "sse"],
+        default=os.getenv("NEWS_MCP_TRANSPORT", "stdio"),
+        help="stdio serves the process that spawned the server; the HTTP transports serve many clients at once",
+    )
+    parser.add_argument("--host", default=os.getenv("NEWS_MCP_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("NEWS_MCP_PORT", "8001"))
+    )
+    args = parser.parse_args()
+
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    anyio.run(serve, args.transport)
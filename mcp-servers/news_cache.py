@@ -0,0 +1,237 @@
+import re
+import time
+import sqlite3
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_QUOTED_OR_WORD = re.compile(r'"+([^"]*)"+|[^\s"]+')
+_BOOLEAN_OPERATORS = {"and", "or", "not"}
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a News search query for use as a cache key.
+
+    Collapses whitespace, upper-cases boolean operators outside quotes, and drops
+    redundant quoting (repeated quote characters, empty quotes, and padding inside
+    quotes), so equivalent spellings of a query share one cache entry.
+    """
+    tokens = []
+    for match in _QUOTED_OR_WORD.finditer(query):
+        if match.group(0).startswith('"'):
+            text = " ".join(match.group(1).split())
+            if text:
+                tokens.append(f'"{text}"')
+        elif match.group(0).lower() in _BOOLEAN_OPERATORS:
+            tokens.append(match.group(0).upper())
+        else:
+            tokens.append(match.group(0))
+    return " ".join(tokens)
+
+
+class TTLCache:
+    """
+    In-memory cache with a bounded number of entries and a per-entry time to live.
+
+    The least recently used entry is evicted when the cache is full. A ttl of 0
+    disables caching.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class StoryCache:
+    """
+    Persistent story cache in a SQLite database, shared by server processes and restarts.
+
+    Stores the simplified story JSON keyed by story ID together with its versionCreated,
+    so an entry can be dropped when a newer version of the story shows up. When the
+    stored stories exceed max_bytes the least recently read ones are evicted.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 100 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stories (
+                    story_id TEXT PRIMARY KEY,
+                    version_created TEXT,
+                    data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS stories_accessed_at ON stories (accessed_at)"
+            )
+        return self._db
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, story_id: str) -> Optional[str]:
+        """Get the cached story JSON, or None"""
+        if not self.enabled:
+            return None
+        try:
+            db = self._connect()
+            row = db.execute(
+                "SELECT data FROM stories WHERE story_id = ?", (story_id,)
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE stories SET accessed_at = ? WHERE story_id = ?",
+                    (time.time(), story_id),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Story cache read failed: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def contains(self, story_id: str) -> bool:
+        """Check whether a story is cached, without counting a lookup"""
+        if not self.enabled:
+            return False
+        try:
+            return (
+                self._connect()
+                .execute("SELECT 1 FROM stories WHERE story_id = ?", (story_id,))
+                .fetchone()
+                is not None
+            )
+        except sqlite3.Error:
+            return False
+
+    def set(self, story_id: str, version_created: Optional[str], data: str):
+        """Store a story and evict the least recently read stories beyond max_bytes"""
+        if not self.enabled:
+            return
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO stories VALUES (?, ?, ?, ?, ?)",
+                    (story_id, version_created, data, size, time.time()),
+                )
+                self._evict(db)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Story cache write failed: {e}")
+
+    def _evict(self, db: sqlite3.Connection):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM stories").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for story_id, size in db.execute(
+            "SELECT story_id, size FROM stories ORDER BY accessed_at"
+        ).fetchall():
+            db.execute("DELETE FROM stories WHERE story_id = ?", (story_id,))
+            total -= size
+            evicted += 1
+            if total <= self.max_bytes:
+                break
+        logger.debug(f"Evicted {evicted} stories from story cache")
+
+    def revalidate(self, story_id: str, version_created: Optional[str]):
+        """Drop a cached story if the given versionCreated shows it has been updated"""
+        if not self.enabled or not version_created:
+            return
+        try:
+            self._connect().execute(
+                "DELETE FROM stories WHERE story_id = ? AND version_created IS NOT ?",
+                (story_id, version_created),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Story cache revalidation failed: {e}")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def info(self) -> dict:
+        entries, size = 0, 0
+        if self.enabled:
+            try:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM stories"
+                ).fetchone()
+            except sqlite3.Error:
+                pass
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
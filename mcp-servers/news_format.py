@@ -0,0 +1,254 @@
+import re
+from collections import OrderedDict
+from html import unescape
+from html.parser import HTMLParser
+from typing import Optional
+
+# Output profiles of the news tools, from the smallest payload to the largest
+PROFILES = ("minimal", "standard", "full")
+
+# Fields included in each profile
+HEADLINE_FIELDS = {
+    "minimal": ("story_id", "headline"),
+    "standard": ("story_id", "headline", "publication_date"),
+    "full": ("story_id", "headline", "publication_date", "urgency", "source", "language"),
+}
+STORY_FIELDS = {
+    "minimal": ("story_id", "headline", "publication_date", "source"),
+    "standard": (
+        "story_id", "headline", "publication_date", "urgency", "source", "content_type", "content",
+    ),
+    "full": (
+        "story_id", "headline", "publication_date", "urgency", "source", "content_type", "content",
+    ),
+}
+
+_BLOCK_TAGS = {
+    "p", "br", "div", "li", "ul", "ol", "tr", "table", "pre", "blockquote",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+}
+_SKIP_TAGS = {"script", "style", "head", "title"}
+_LOOKS_LIKE_HTML = re.compile(r"<(p|br|div|pre|html|body|span|a|li|table)\b", re.IGNORECASE)
+
+
+def check_output_options(profile: str, max_chars: Optional[int]):
+    """Raise ValueError for an unknown profile or a max_chars below 1"""
+    if profile not in PROFILES:
+        raise ValueError(f"profile must be one of {', '.join(PROFILES)}, got {profile!r}")
+    if max_chars is not None and max_chars < 1:
+        raise ValueError("max_chars must be a positive number")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Plain text of story HTML, one paragraph per line"""
+    if not _LOOKS_LIKE_HTML.search(html):
+        text = unescape(html)
+    else:
+        extractor = _TextExtractor()
+        extractor.feed(html)
+        extractor.close()
+        text = "".join(extractor.parts)
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class _TextCache:
+    """Plain text of recently shaped stories, least recently used dropped beyond max_chars"""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.chars = 0
+        self._texts: OrderedDict[tuple, str] = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[str]:
+        text = self._texts.get(key)
+        if text is not None:
+            self._texts.move_to_end(key)
+        return text
+
+    def set(self, key: tuple, text: str):
+        if len(text) > self.max_chars:
+            return
+        self.chars += len(text) - len(self._texts.pop(key, ""))
+        self._texts[key] = text
+        while self.chars > self.max_chars:
+            _, dropped = self._texts.popitem(last=False)
+            self.chars -= len(dropped)
+
+
+# Converting a multi-MB story from HTML takes hundreds of milliseconds, so the text is
+# kept per story version and repeat requests (e.g. story cache hits) skip it
+_story_texts = _TextCache(max_chars=20_000_000)
+
+
+def story_text(story: dict) -> str:
+    """Plain text of a simplified story's HTML content, converted once per story version"""
+    key = (story.get("story_id"), story.get("publication_date"), len(story["content"]))
+    text = _story_texts.get(key) if key[0] else None
+    if text is None:
+        text = html_to_text(story["content"])
+        if key[0]:
+            _story_texts.set(key, text)
+    return text
+
+
+def truncate(text: str, max_chars: Optional[int]) -> str:
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more characters]"
+
+
+def extract_headline(item: dict) -> dict:
+    """Simplified headline with all fields, from one item of a headlines response"""
+    headline = {
+        "story_id": item.get("storyId", ""),
+        "headline": "",
+        "publication_date": "",
+        "urgency": "",
+        "source": "",
+        "language": "",
+    }
+
+    # Extract headline from nested structure
+    if (
+        "newsItem" in item
+        and "itemMeta" in item["newsItem"]
+        and "title" in item["newsItem"]["itemMeta"]
+    ):
+        titles = item["newsItem"]["itemMeta"]["title"]
+        if titles and len(titles) > 0 and "$" in titles[0]:
+            headline["headline"] = titles[0]["$"]
+
+    # Extract the version date
+    if (
+        "newsItem" in item
+        and "itemMeta" in item["newsItem"]
+        and "versionCreated" in item["newsItem"]["itemMeta"]
+    ):
+        headline["publication_date"] = item["newsItem"]["itemMeta"]["versionCreated"].get("$") or ""
+
+    # Extract urgency, source and language
+    if "newsItem" in item and "contentMeta" in item["newsItem"]:
+        content_meta = item["newsItem"]["contentMeta"]
+        if "urgency" in content_meta:
+            headline["urgency"] = content_meta["urgency"].get("$", "")
+        sources = content_meta.get("infoSource")
+        if sources and len(sources) > 0:
+            headline["source"] = sources[0].get("_qcode", "")
+        languages = content_meta.get("language")
+        if languages and len(languages) > 0:
+            headline["language"] = languages[0].get("_tag", "")
+
+    return headline
+
+
+def extract_story(storyId: str, data: dict) -> dict:
+    """Simplified story with all fields, from a story response"""
+    simplified_story = {
+        "story_id": storyId,
+        "headline": "",
+        "publication_date": "",
+        "urgency": "",
+        "content_type": "",
+        "content": "",
+        "source": "",
+    }
+
+    if "newsItem" in data:
+        news_item = data["newsItem"]
+
+        # Extract headline
+        if "contentMeta" in news_item and "headline" in news_item["contentMeta"]:
+            headlines = news_item["contentMeta"]["headline"]
+            if headlines and len(headlines) > 0 and "$" in headlines[0]:
+                simplified_story["headline"] = headlines[0]["$"]
+
+        # Extract publication date
+        if "itemMeta" in news_item and "versionCreated" in news_item["itemMeta"]:
+            simplified_story["publication_date"] = news_item["itemMeta"][
+                "versionCreated"
+            ]["$"]
+
+        # Extract urgency
+        if "contentMeta" in news_item and "urgency" in news_item["contentMeta"]:
+            simplified_story["urgency"] = news_item["contentMeta"]["urgency"]["$"]
+
+        # Extract source
+        if "contentMeta" in news_item and "infoSource" in news_item["contentMeta"]:
+            sources = news_item["contentMeta"]["infoSource"]
+            if sources and len(sources) > 0:
+                simplified_story["source"] = sources[0].get("_qcode", "")
+
+        # Check content type and extract relevant content
+        if "contentSet" in news_item:
+            content_set = news_item["contentSet"]
+            if "inlineData" in content_set:
+                inline_data = content_set["inlineData"]
+                if inline_data and len(inline_data) > 0:
+                    content_type = inline_data[0].get("_contenttype", "")
+                    simplified_story["content_type"] = content_type
+
+                    # For images, just note it's an image - don't include base64 data
+                    if "image" in content_type:
+                        simplified_story["content"] = (
+                            "Image content (binary data not included)"
+                        )
+                    else:
+                        # For text content, include the actual content
+                        simplified_story["content"] = inline_data[0].get("$", "")
+
+    return simplified_story
+
+
+def extract_rics(item: dict) -> list[str]:
+    """RICs the item is about, from the R: subject codes of a headline item or story response"""
+    subjects = item.get("newsItem", {}).get("contentMeta", {}).get("subject") or []
+    return [
+        subject["_qcode"][2:]
+        for subject in subjects
+        if subject.get("_qcode", "").startswith("R:")
+    ]
+
+
+def shape_headline(headline: dict, profile: str = "standard") -> dict:
+    """The fields of a simplified headline included in the profile"""
+    return {field: headline.get(field, "") for field in HEADLINE_FIELDS[profile]}
+
+
+def shape_story(story: dict, profile: str = "standard", max_chars: Optional[int] = None) -> dict:
+    """
+    The fields of a simplified story included in the profile.
+
+    The standard profile has the content as plain text, the full profile as stored
+    (usually HTML). max_chars caps the length of the content.
+    """
+    shaped = {field: story.get(field, "") for field in STORY_FIELDS[profile]}
+    if "content" in shaped:
+        content = shaped["content"]
+        if profile == "standard" and content and "html" in shaped["content_type"]:
+            content = story_text(story)
+        shaped["content"] = truncate(content, max_chars)
+    return shaped
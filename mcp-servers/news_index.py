@@ -0,0 +1,286 @@
+import re
+import time
+import sqlite3
+import logging
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from news_format import html_to_text
+
+logger = logging.getLogger(__name__)
+
+# Relative weights of headline, body and RIC matches in the BM25 ranking
+_COLUMN_WEIGHTS = (3.0, 1.0, 3.0)
+_OPERATORS = {"AND", "OR", "NOT"}
+_SEARCH_TERM = re.compile(r'"([^"]*)"|[()]|[^\s()"]+')
+# Story bodies are indexed up to this many characters, so multi-MB stories stay cheap to index
+_MAX_BODY_CHARS = 200_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    id INTEGER PRIMARY KEY,
+    story_id TEXT NOT NULL UNIQUE,
+    headline TEXT NOT NULL,
+    body TEXT,
+    rics TEXT NOT NULL,
+    publication_date TEXT,
+    published_at REAL,
+    urgency INTEGER,
+    source TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS news_published_at ON news (published_at);
+CREATE INDEX IF NOT EXISTS news_indexed_at ON news (indexed_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    headline, body, rics, content='news', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news BEGIN
+    INSERT INTO news_fts (rowid, headline, body, rics) VALUES (new.id, new.headline, new.body, new.rics);
+END;
+CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news BEGIN
+    INSERT INTO news_fts (news_fts, rowid, headline, body, rics)
+    VALUES ('delete', old.id, old.headline, old.body, old.rics);
+END;
+CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE ON news BEGIN
+    INSERT INTO news_fts (news_fts, rowid, headline, body, rics)
+    VALUES ('delete', old.id, old.headline, old.body, old.rics);
+    INSERT INTO news_fts (rowid, headline, body, rics) VALUES (new.id, new.headline, new.body, new.rics);
+END;
+"""
+
+# A headline only replaces the indexed item when it is a newer version; a story body always does
+_UPSERT = """
+INSERT INTO news (story_id, headline, body, rics, publication_date, published_at, urgency, source, indexed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (story_id) DO UPDATE SET
+    headline = excluded.headline,
+    body = COALESCE(excluded.body, news.body),
+    rics = CASE WHEN excluded.rics != '' THEN excluded.rics ELSE news.rics END,
+    publication_date = excluded.publication_date,
+    published_at = excluded.published_at,
+    urgency = excluded.urgency,
+    source = excluded.source,
+    indexed_at = excluded.indexed_at
+WHERE excluded.publication_date IS NOT news.publication_date
+    OR (excluded.body IS NOT NULL AND excluded.body IS NOT news.body)
+"""
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """Unix time of an ISO timestamp such as 2025-06-10T10:00:00.000Z, or None"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def date_bound(value: str, end: bool = False) -> float:
+    """
+    Unix time of a date (2025-06-10) or time (2025-06-10T14:00:00Z) given as a search bound.
+    A date as the end of a range includes the whole day. Raises ValueError when invalid.
+    """
+    if len(value) == 10:
+        day = date.fromisoformat(value) + timedelta(days=1 if end else 0)
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+    timestamp = _timestamp(value)
+    if timestamp is None:
+        raise ValueError(f"invalid date {value!r}, expected e.g. 2025-06-10 or 2025-06-10T14:00:00Z")
+    return timestamp
+
+
+def match_query(query: str) -> str:
+    """
+    FTS5 query for a search: words and "quoted phrases" are matched as phrases, so RICs like
+    MSFT.O need no quoting, a trailing * matches a prefix, and AND, OR, NOT and parentheses
+    combine terms. Terms without an operator between them must all match.
+    """
+    terms = []
+    for match in _SEARCH_TERM.finditer(query):
+        term = match.group(0)
+        if match.group(1) is not None:
+            if match.group(1).strip():
+                terms.append(f'"{match.group(1).strip()}"')
+        elif term in ("(", ")"):
+            terms.append(term)
+        elif term.upper() in _OPERATORS:
+            terms.append(term.upper())
+        elif term.endswith("*") and len(term) > 1:
+            terms.append(f'"{term[:-1]}"*')
+        else:
+            terms.append(f'"{term}"')
+    return " ".join(terms)
+
+
+class NewsIndex:
+    """
+    Full-text index of the headlines and stories fetched from the news API, in SQLite FTS5.
+
+    Headlines are indexed as they are listed, with their RICs, and get their body once the
+    story is fetched. Searches rank matches with BM25 and can be limited to a publication
+    date range, so repeated research on a topic is answered without calling the API. When
+    the index holds more than max_items, the least recently indexed items are dropped.
+    """
+
+    def __init__(self, path: Path, max_items: int = 100_000):
+        self.path = Path(path)
+        self.max_items = max_items
+        self.searches = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    def add_headlines(self, headlines: list[dict], rics: list[list[str]]):
+        """Index simplified headlines (see extract_headline) with the RICs of each"""
+        now = time.time()
+        self._write(
+            [
+                (
+                    headline["story_id"],
+                    headline["headline"],
+                    None,
+                    " ".join(item_rics),
+                    headline["publication_date"] or None,
+                    _timestamp(headline["publication_date"]),
+                    headline["urgency"] or None,
+                    headline["source"],
+                    now,
+                )
+                for headline, item_rics in zip(headlines, rics)
+                if headline["story_id"]
+            ]
+        )
+
+    def add_story(self, story: dict, rics: list[str]):
+        """Index a simplified story (see extract_story) with its body as plain text"""
+        content = story["content"][:_MAX_BODY_CHARS]
+        if "image" in story["content_type"]:
+            content = ""
+        elif "html" in story["content_type"]:
+            content = html_to_text(content)
+        self._write(
+            [
+                (
+                    story["story_id"],
+                    story["headline"],
+                    content,
+                    " ".join(rics),
+                    story["publication_date"] or None,
+                    _timestamp(story["publication_date"]),
+                    story["urgency"] or None,
+                    story["source"],
+                    time.time(),
+                )
+            ]
+        )
+
+    def _write(self, rows: list[tuple]):
+        if not self.enabled or not rows:
+            return
+        try:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(_UPSERT, rows)
+                self._evict(db)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"News index write failed: {e}")
+
+    def _evict(self, db: sqlite3.Connection):
+        excess = db.execute("SELECT COUNT(*) FROM news").fetchone()[0] - self.max_items
+        if excess > 0:
+            db.execute(
+                "DELETE FROM news WHERE id IN (SELECT id FROM news ORDER BY indexed_at LIMIT ?)",
+                (excess,),
+            )
+            logger.debug(f"Evicted {excess} items from news index")
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        Indexed items matching query (see match_query), best first, published at or after
+        since and before until (Unix times). Raises ValueError for an invalid query.
+        """
+        if not self.enabled:
+            return []
+        expression = match_query(query)
+        if not expression:
+            raise ValueError("query is empty")
+        self.searches += 1
+        try:
+            rows = self._connect().execute(
+                f"""
+                SELECT news.story_id, news.headline, news.publication_date, news.urgency,
+                       news.source, news.rics, news.body IS NOT NULL,
+                       snippet(news_fts, -1, '', '', '...', 24)
+                FROM news_fts JOIN news ON news.id = news_fts.rowid
+                WHERE news_fts MATCH ?
+                  AND (? IS NULL OR news.published_at >= ?)
+                  AND (? IS NULL OR news.published_at < ?)
+                ORDER BY bm25(news_fts, {", ".join(map(str, _COLUMN_WEIGHTS))})
+                LIMIT ?
+                """,
+                (expression, since, since, until, until, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            if "fts5" in str(e) or "syntax" in str(e):
+                raise ValueError(f"invalid search query {query!r}") from e
+            raise
+        return [
+            {
+                "story_id": story_id,
+                "headline": headline,
+                "publication_date": publication_date or "",
+                "urgency": urgency or "",
+                "source": source,
+                "rics": rics.split(),
+                "story_indexed": bool(story_indexed),
+                "snippet": snippet,
+            }
+            for story_id, headline, publication_date, urgency, source, rics, story_indexed, snippet in rows
+        ]
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def info(self) -> dict:
+        items, stories = 0, 0
+        if self.enabled:
+            try:
+                items, stories = self._connect().execute(
+                    "SELECT COUNT(*), COUNT(body) FROM news"
+                ).fetchone()
+            except sqlite3.Error:
+                pass
+        return {
+            "items": items,
+            "stories": stories,
+            "max_items": self.max_items,
+            "searches": self.searches,
+        }
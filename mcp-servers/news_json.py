@@ -0,0 +1,157 @@
+import os
+import re
+import json
+import logging
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# JSON codec of the news server: "auto" uses orjson when it is installed, "stdlib" always uses json
+JSON_CODEC = os.getenv("RDP_JSON_CODEC", "auto").lower()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if JSON_CODEC == "stdlib":
+    orjson = None
+elif orjson is None and JSON_CODEC == "orjson":
+    logger.warning("RDP_JSON_CODEC is orjson but the orjson package is not installed, using json")
+
+CODEC = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON, from a response body as bytes without decoding it to str first"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> str:
+    """
+    Encode compact JSON. orjson keeps non-ASCII characters as is, json escapes them
+    (its faster path); either decodes to the same value.
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"))
+
+
+# base64 text as it appears in a JSON string, where "/" may be escaped and lines wrapped
+_BASE64 = re.compile(rb"[A-Za-z0-9+/=]*(?:\\[/rn][A-Za-z0-9+/=]*)*")
+
+
+def _backslashes_before(data: bytes, start: int, index: int) -> int:
+    count = 0
+    while index - count > start and data[index - count - 1] == 0x5C:
+        count += 1
+    return count
+
+
+def _closing_quote(data: bytes, start: int, limit: int) -> int:
+    """
+    Index of the quote closing a JSON string whose content continues at start, or limit
+    when it is not before limit (less one, for a backslash escaping the byte at limit)
+    """
+    quote = data.find(b'"', start, limit)
+    while quote != -1 and _backslashes_before(data, start, quote) % 2:
+        quote = data.find(b'"', quote + 1, limit)
+    if quote != -1:
+        return quote
+    return limit - _backslashes_before(data, start, limit) % 2
+
+
+class BinaryPayloadFilter:
+    """
+    Copy a JSON document fed in chunks, leaving out the base64 data of binary "$" values.
+
+    Story responses carry images and other media as base64 in inlineData "$" values, ahead
+    of their content type, and the news tools never return that data. A "$" string that is
+    still base64 after its first min_bytes is dropped as it streams in, so it is never held
+    in memory or decoded, and comes out as an empty string. Everything else is copied as is.
+    """
+
+    def __init__(self, min_bytes: int = 4096):
+        self.min_bytes = min_bytes
+        self.skipped_bytes = 0
+        self._out = bytearray()
+        self._carry = b""
+        self._in_string = False
+        # Whether the current string is the value of a "$" key, and whether it is being dropped
+        self._payload: Optional[bytearray] = None
+        self._skipping = False
+        # Set after a "$" string, with the bytes seen since, to recognize its value
+        self._after_dollar: Optional[bytearray] = None
+        self._string_start = 0
+
+    def feed(self, chunk: bytes):
+        data = self._carry + chunk if self._carry else chunk
+        self._carry = b""
+        pos, end = 0, len(data)
+        while pos < end:
+            if not self._in_string:
+                quote = data.find(b'"', pos)
+                stop = end if quote == -1 else quote
+                self._out += data[pos:stop]
+                if self._after_dollar is not None and len(self._after_dollar) < 64:
+                    self._after_dollar += data[pos:stop]
+                if quote == -1:
+                    return
+                self._out += b'"'
+                if self._after_dollar is not None and self._after_dollar.strip() == b":":
+                    self._payload = bytearray()
+                self._after_dollar = None
+                self._in_string = True
+                self._string_start = len(self._out)
+                pos = quote + 1
+                continue
+
+            # Only scan as far as needed to tell whether a "$" value is base64
+            limit = end if self._payload is None or self._skipping else min(end, pos + self.min_bytes)
+            stop = _closing_quote(data, pos, limit)
+            self._string_data(data[pos:stop])
+            pos = stop
+            if pos == end:
+                return
+            if data[pos] == 0x22:
+                self._end_string()
+                pos += 1
+            elif pos == end - 1:  # "\" whose escaped character is in the next chunk
+                self._carry = data[pos:]
+                return
+
+    def _string_data(self, data: bytes):
+        if self._payload is None:
+            self._out += data
+        elif self._skipping:
+            self.skipped_bytes += len(data)
+        elif len(self._payload) + len(data) <= self.min_bytes:
+            self._payload += data
+        else:
+            # Decide on the first min_bytes, allowing for an escape cut in two
+            head = self._payload + data[: self.min_bytes - len(self._payload)]
+            if _BASE64.match(head).end() >= len(head) - 1:
+                self._skipping = True
+                self.skipped_bytes += len(self._payload) + len(data)
+            else:
+                # Text, copy it like any other string
+                self._out += self._payload
+                self._out += data
+                self._payload = None
+
+    def _end_string(self):
+        if self._payload is not None:
+            if not self._skipping:
+                self._out += self._payload
+            self._payload = None
+            self._skipping = False
+        elif len(self._out) == self._string_start + 1 and self._out[-1] == 0x24:  # "$"
+            self._after_dollar = bytearray()
+        self._out += b'"'
+        self._in_string = False
+
+    def getvalue(self) -> bytes:
+        """The document fed so far, without the dropped payloads"""
+        return bytes(self._out) + self._carry
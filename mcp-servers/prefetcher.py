@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class StoryPrefetcher:
+    """
+    Speculatively fetch the top stories of a headline search into the story cache.
+
+    Prefetching is best effort and never competes with tool calls: at most max_in_flight
+    stories are fetched at a time, nothing is started while the rate limiter is saturated,
+    and cancel_all() drops in-flight prefetches when a tool call finds the limiter busy.
+    A hit is a story requested by a tool call after it was prefetched; prefetched stories
+    that drop out of the tracking window without being requested count as waste.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[object]],
+        is_cached: Callable[[str], bool],
+        is_saturated: Callable[[], bool],
+        top_n: int = 3,
+        max_in_flight: int = 2,
+        track_window: int = 1000,
+    ):
+        self.fetch = fetch
+        self.is_cached = is_cached
+        self.is_saturated = is_saturated
+        self.top_n = top_n
+        self.max_in_flight = max_in_flight
+        self.track_window = track_window
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._claimed: set[str] = set()
+        self._prefetched: OrderedDict[str, None] = OrderedDict()
+        self.stats = {
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "skipped_budget": 0,
+            "skipped_saturated": 0,
+            "hits": 0,
+            "wasted": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_n > 0 and self.max_in_flight > 0
+
+    def schedule(self, story_ids: list[str]):
+        """Start background fetches for the first top_n stories that aren't cached yet"""
+        if not self.enabled:
+            return
+
+        for story_id in story_ids[: self.top_n]:
+            if (
+                not story_id
+                or story_id in self._tasks
+                or story_id in self._prefetched
+                or self.is_cached(story_id)
+            ):
+                continue
+            if len(self._tasks) >= self.max_in_flight:
+                self.stats["skipped_budget"] += 1
+                continue
+            if self.is_saturated():
+                self.stats["skipped_saturated"] += 1
+                continue
+
+            self._tasks[story_id] = asyncio.ensure_future(self._prefetch(story_id))
+            self.stats["started"] += 1
+
+    async def _prefetch(self, story_id: str):
+        try:
+            await self.fetch(story_id)
+            self.stats["completed"] += 1
+            if story_id in self._claimed:
+                self._claimed.discard(story_id)
+            else:
+                self._remember(story_id)
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            self._claimed.discard(story_id)
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            self._claimed.discard(story_id)
+            logger.debug(f"Prefetch of {story_id} failed: {e}")
+        finally:
+            self._tasks.pop(story_id, None)
+
+    def _remember(self, story_id: str):
+        self._prefetched[story_id] = None
+        while len(self._prefetched) > self.track_window:
+            self._prefetched.popitem(last=False)
+            self.stats["wasted"] += 1
+
+    def record_request(self, story_id: str):
+        """Note that a tool call asked for a story, counting a hit if it was prefetched"""
+        if story_id in self._prefetched:
+            del self._prefetched[story_id]
+            self.stats["hits"] += 1
+        elif story_id in self._tasks and story_id not in self._claimed:
+            self._claimed.add(story_id)
+            self.stats["hits"] += 1
+
+    def cancel_all(self):
+        """Cancel in-flight prefetches so they stop competing with tool calls"""
+        for task in self._tasks.values():
+            task.cancel()
+
+    async def close(self):
+        tasks = list(self._tasks.values())
+        self.cancel_all()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def info(self) -> dict:
+        return {
+            "top_n": self.top_n,
+            "in_flight": len(self._tasks),
+            "unused": len(self._prefetched),
+            **self.stats,
+        }
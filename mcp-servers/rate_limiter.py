@@ -0,0 +1,73 @@
+import time
+import asyncio
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Allows bursts of up to capacity requests and a sustained rate of rate requests per
+    second. Callers over the limit are queued in arrival order rather than rejected.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._waiting = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting for a token"""
+        return self._waiting
+
+    @property
+    def saturated(self) -> bool:
+        """True when the next caller would have to wait"""
+        self._refill()
+        return self._waiting > 0 or self._tokens < 1
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        if self.rate <= 0:
+            return
+
+        self._waiting += 1
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, so the queue is fair
+            async with self._get_lock():
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self._waiting -= 1
+
+    def info(self) -> dict:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "available": round(self._tokens, 2),
+            "queue_depth": self._waiting,
+        }
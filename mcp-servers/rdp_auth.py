@@ -1,56 +1,180 @@
 import os
+import asyncio
 import httpx
 import logging
-import json
+import random
 import tempfile
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
 from pathlib import Path
+from urllib.parse import urlsplit
+from circuit_breaker import CircuitBreaker
+from rate_limiter import TokenBucket
+from token_store import FileTokenStore, TokenStore
 
 logger = logging.getLogger(__name__)
 
 RDP_USERNAME = os.getenv("RDP_USERNAME")
 RDP_PASSWORD = os.getenv("RDP_PASSWORD")
 RDP_CLIENT_ID = os.getenv("RDP_CLIENT_ID")
-RDP_BASE_URL = "https://api.refinitiv.com"
+RDP_BASE_URL = os.getenv("RDP_BASE_URL", "https://api.refinitiv.com")
+
+CACHE_FILE = Path(
+    os.getenv(
+        "RDP_TOKEN_CACHE_FILE", Path(tempfile.gettempdir()) / "rdp_token_cache.json"
+    )
+)
+# "file" shares one token between all news server processes using CACHE_FILE, "memory" keeps it per process
+TOKEN_STORE = os.getenv("RDP_TOKEN_STORE", "file").lower()
+
+# Shared HTTP client: connection pool limits, keep-alive and optional HTTP/2 (needs the h2 package)
+HTTP_MAX_CONNECTIONS = int(os.getenv("RDP_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("RDP_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("RDP_HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("RDP_HTTP2", "false").lower() == "true"
+
+# Retries of idempotent requests on 429/5xx and connection errors (delays in seconds)
+MAX_RETRIES = int(os.getenv("RDP_MAX_RETRIES", "3"))
+RETRY_BACKOFF_BASE = float(os.getenv("RDP_RETRY_BACKOFF_BASE", "0.5"))
+RETRY_BACKOFF_MAX = float(os.getenv("RDP_RETRY_BACKOFF_MAX", "10"))
+# Longest Retry-After we are willing to wait; longer ones are returned to the caller
+RETRY_AFTER_MAX = float(os.getenv("RDP_RETRY_AFTER_MAX", "30"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Circuit breaker per endpoint: consecutive failed requests to open, seconds before a trial request
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("RDP_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("RDP_BREAKER_RESET_TIMEOUT", "30"))
+
+# Client-side rate limits (requests per second, burst size); a rate of 0 disables the limit
+HEADLINES_RATE = float(os.getenv("RDP_HEADLINES_RATE", "5"))
+HEADLINES_BURST = float(os.getenv("RDP_HEADLINES_BURST", "10"))
+STORIES_RATE = float(os.getenv("RDP_STORIES_RATE", "10"))
+STORIES_BURST = float(os.getenv("RDP_STORIES_BURST", "20"))
+
+# Background refresher: how far ahead of expires_at to refresh, and retry backoff bounds (seconds).
+# The lower bound is also the shortest time between two refreshes.
+TOKEN_REFRESH_LEAD = float(os.getenv("RDP_TOKEN_REFRESH_LEAD", "60"))
+TOKEN_REFRESH_JITTER = float(os.getenv("RDP_TOKEN_REFRESH_JITTER", "0.1"))
+TOKEN_REFRESH_BACKOFF_MIN = float(os.getenv("RDP_TOKEN_REFRESH_BACKOFF_MIN", "5"))
+TOKEN_REFRESH_BACKOFF_MAX = float(os.getenv("RDP_TOKEN_REFRESH_BACKOFF_MAX", "300"))
+
+# Token cache, held in memory and written to the store only when the token changes
+_token_store: TokenStore = (
+    TokenStore() if TOKEN_STORE == "memory" else FileTokenStore(CACHE_FILE)
+)
+_token_lock: Optional[asyncio.Lock] = None
+_token_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+# Rate limiters keyed by the API path they apply to, shared by all tools in this process
+_rate_limiters: dict[str, TokenBucket] = {
+    "/data/news/v1/headlines": TokenBucket("headlines", HEADLINES_RATE, HEADLINES_BURST),
+    "/data/news/v1/stories": TokenBucket("stories", STORIES_RATE, STORIES_BURST),
+}
+
+_refresher_task: Optional[asyncio.Task] = None
+_refresher_state = {
+    "next_refresh_at": None,
+    "last_refresh_at": None,
+    "last_error": None,
+    "consecutive_failures": 0,
+}
+
+
+def _get_token_cache() -> dict:
+    """Get current token cache from memory (the store is only read on first use)"""
+    return _token_store.peek()
+
+
+def _set_token_cache(cache: dict):
+    """Replace the token cache and persist it to the token store"""
+    _token_store.save(cache)
+
+
+def _get_token_lock() -> asyncio.Lock:
+    """Get the lock serialising token fetches for the running event loop"""
+    global _token_lock, _token_lock_loop
+    loop = asyncio.get_running_loop()
+    if _token_lock is None or _token_lock_loop is not loop:
+        _token_lock = asyncio.Lock()
+        _token_lock_loop = loop
+    return _token_lock
 
-CACHE_FILE = Path(tempfile.gettempdir()) / "rdp_token_cache.json"
+
+def _is_token_valid(token_cache: dict) -> bool:
+    return bool(
+        token_cache["access_token"]
+        and token_cache["expires_at"]
+        and datetime.now() < token_cache["expires_at"]
+    )
 
 
-def _load_token_cache() -> dict:
-    """Load token cache from file"""
+def _accept_encoding() -> str:
+    """Content encodings we can decode; br only when a brotli decoder is installed"""
+    encodings = ["gzip", "deflate"]
     try:
-        if CACHE_FILE.exists():
-            with open(CACHE_FILE, 'r') as f:
-                cache = json.load(f)
-                # Convert expires_at string back to datetime
-                if cache.get("expires_at"):
-                    cache["expires_at"] = datetime.fromisoformat(cache["expires_at"])
-                return cache
-    except Exception as e:
-        logger.warning(f"Failed to load token cache: {e}")
-    
-    return {"access_token": None, "expires_at": None, "refresh_token": None}
+        import brotli  # noqa: F401
+
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
 
 
-def _save_token_cache(cache: dict):
-    """Save token cache to file"""
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
     try:
-        # Convert datetime to string for JSON serialization
-        cache_to_save = cache.copy()
-        if cache_to_save.get("expires_at"):
-            cache_to_save["expires_at"] = cache_to_save["expires_at"].isoformat()
-        
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache_to_save, f)
-        logger.debug(f"Token cache saved to {CACHE_FILE}")
-    except Exception as e:
-        logger.warning(f"Failed to save token cache: {e}")
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("RDP_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+        return False
+    return True
 
 
-def _get_token_cache() -> dict:
-    """Get current token cache (loads from file each time)"""
-    return _load_token_cache()
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for RDP requests, creating it on first use.
+
+    Connections are kept alive and reused across tool calls, so only the first request
+    to api.refinitiv.com pays for the TCP and TLS handshake.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            headers={"Accept-Encoding": _accept_encoding()},
+            timeout=30.0,
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (call on server shutdown)"""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.aclose()
+        logger.info("HTTP client closed")
+    _http_client = None
+    _http_client_loop = None
 
 
 def check_credentials() -> bool:
@@ -73,22 +197,10 @@ def check_credentials() -> bool:
     return True
 
 
-async def get_auth_token() -> Optional[str]:
+async def _fetch_auth_token() -> Optional[str]:
     """
-    Get the authentication token for the RDP API with caching to avoid unnecessary re-authentication
+    Authenticate with username and password and cache the new token. Callers must hold the token lock.
     """
-    # Load current cache from file
-    token_cache = _get_token_cache()
-    
-    # Check if we have a valid cached token
-    if (
-        token_cache["access_token"]
-        and token_cache["expires_at"]
-        and datetime.now() < token_cache["expires_at"]
-    ):
-        logger.info("Using cached auth token")
-        return token_cache["access_token"]
-
     # Check if required credentials are available
     if not check_credentials():
         return None
@@ -103,197 +215,465 @@ async def get_auth_token() -> Optional[str]:
         f"Auth payload (masked): grant_type=password&username={RDP_USERNAME}&scope=trapi&client_id={RDP_CLIENT_ID}&password=***&takeExclusiveSignOnControl=true"
     )
 
-    async with httpx.AsyncClient() as client:
+    client = get_http_client()
+    try:
+        response = await client.post(
+            auth_token_url, headers=headers, data=payload, timeout=30.0
+        )
+        logger.info(f"Debug - Auth response status: {response.status_code}")
+        logger.info(f"Debug - Auth response headers: {dict(response.headers)}")
+
+        if response.status_code != 200:
+            response_text = response.text
+            logger.error(f"Debug - Auth error response body: {response_text}")
+
+        response.raise_for_status()
+        data = response.json()
+
+        # Cache the token with expiration
+        access_token = data.get("access_token")
+        expires_in = data.get(
+            "expires_in", 3600
+        )  # Default to 1 hour if not provided
+
+        # Convert expires_in to integer if it's a string
         try:
-            response = await client.post(
-                auth_token_url, headers=headers, data=payload, timeout=30.0
+            expires_in = int(expires_in)
+        except (ValueError, TypeError):
+            logger.warning(
+                f"Invalid expires_in value: {expires_in}, using default 3600"
             )
-            logger.info(f"Debug - Auth response status: {response.status_code}")
-            logger.info(f"Debug - Auth response headers: {dict(response.headers)}")
+            expires_in = 3600
 
-            if response.status_code != 200:
-                response_text = response.text
-                logger.error(f"Debug - Auth error response body: {response_text}")
+        if access_token:
+            # Update cache and save to file
+            token_cache = {
+                "access_token": access_token,
+                "refresh_token": data.get("refresh_token"),
+                # Set expiration to 5 minutes before actual expiry for safety margin
+                "expires_at": datetime.now() + timedelta(seconds=expires_in - 300),
+            }
+            _set_token_cache(token_cache)
 
-            response.raise_for_status()
-            data = response.json()
+            logger.info(
+                f"Debug - Auth success, token cached until {token_cache['expires_at']} (expires_in: {expires_in})"
+            )
+
+        return access_token
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            f"HTTP Error fetching auth token: {e.response.status_code} - {e.response.text}"
+        )
+        return None
+    except Exception as e:
+        logger.error(f"Error fetching auth token: {type(e).__name__}: {e}")
+        return None
+
+
+async def _fetch_refreshed_token() -> Optional[str]:
+    """
+    Refresh the token using the refresh token, falling back to a new password grant.
+    Callers must hold the token lock.
+    """
+    token_cache = _get_token_cache()
 
-            # Cache the token with expiration
+    if not token_cache["refresh_token"]:
+        logger.info("No refresh token available, getting new token")
+        return await _fetch_auth_token()
+
+    logger.info("Attempting to refresh auth token")
+    auth_token_url = f"{RDP_BASE_URL}/auth/oauth2/v1/token"
+    payload = f"grant_type=refresh_token&username={RDP_USERNAME}&client_id={RDP_CLIENT_ID}&refresh_token={token_cache['refresh_token']}"
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+    client = get_http_client()
+    try:
+        response = await client.post(
+            auth_token_url, headers=headers, data=payload, timeout=30.0
+        )
+
+        if response.status_code == 200:
+            data = response.json()
             access_token = data.get("access_token")
-            expires_in = data.get(
-                "expires_in", 3600
-            )  # Default to 1 hour if not provided
+            expires_in = data.get("expires_in", 3600)
 
             # Convert expires_in to integer if it's a string
             try:
                 expires_in = int(expires_in)
             except (ValueError, TypeError):
                 logger.warning(
-                    f"Invalid expires_in value: {expires_in}, using default 3600"
+                    f"Invalid expires_in value in refresh: {expires_in}, using default 3600"
                 )
                 expires_in = 3600
 
             if access_token:
-                # Update cache and save to file
-                token_cache["access_token"] = access_token
-                token_cache["refresh_token"] = data.get("refresh_token")
-                # Set expiration to 5 minutes before actual expiry for safety margin
-                token_cache["expires_at"] = datetime.now() + timedelta(
-                    seconds=expires_in - 300
+                _set_token_cache(
+                    {
+                        "access_token": access_token,
+                        "refresh_token": data.get(
+                            "refresh_token", token_cache["refresh_token"]
+                        ),
+                        "expires_at": datetime.now()
+                        + timedelta(seconds=expires_in - 300),
+                    }
                 )
-                _save_token_cache(token_cache)
 
-                logger.info(
-                    f"Debug - Auth success, token cached until {token_cache['expires_at']} (expires_in: {expires_in})"
-                )
+                logger.info("Token refreshed successfully")
+                return access_token
 
-            return access_token
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                f"HTTP Error fetching auth token: {e.response.status_code} - {e.response.text}"
-            )
-            return None
-        except Exception as e:
-            logger.error(f"Error fetching auth token: {type(e).__name__}: {e}")
-            return None
+        # If refresh fails, fall back to getting a new token
+        logger.info("Token refresh failed, getting new token")
+        return await _fetch_auth_token()
 
+    except Exception as e:
+        logger.error(f"Error refreshing token: {e}")
+        # Fall back to getting a new token
+        return await _fetch_auth_token()
 
-async def refresh_auth_token() -> Optional[str]:
-    """
-    Refresh the authentication token using the refresh token if available
-    """
-    token_cache = _get_token_cache()
-    
-    if not token_cache["refresh_token"]:
-        logger.info("No refresh token available, getting new token")
-        return await get_auth_token()
 
-    logger.info("Attempting to refresh auth token")
-    auth_token_url = f"{RDP_BASE_URL}/auth/oauth2/v1/token"
-    payload = f"grant_type=refresh_token&username={RDP_USERNAME}&client_id={RDP_CLIENT_ID}&refresh_token={token_cache['refresh_token']}"
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+async def _get_or_fetch_token(
+    fetch: Callable[[], Awaitable[Optional[str]]],
+) -> Optional[str]:
+    """
+    Return the stored token if it is still valid, otherwise fetch one.
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                auth_token_url, headers=headers, data=payload, timeout=30.0
-            )
+    Holds the in-process lock and then the token store lock, re-reading the store after
+    each wait, so a refresh done by another request or another process is reused.
+    """
+    async with _get_token_lock():
+        token_cache = _token_store.load()
+        if _is_token_valid(token_cache):
+            logger.info("Using auth token refreshed by another request")
+            return token_cache["access_token"]
 
-            if response.status_code == 200:
-                data = response.json()
-                access_token = data.get("access_token")
-                expires_in = data.get("expires_in", 3600)
+        async with _token_store.lock():
+            token_cache = _token_store.load()
+            if _is_token_valid(token_cache):
+                logger.info("Using auth token refreshed by another process")
+                return token_cache["access_token"]
 
-                # Convert expires_in to integer if it's a string
-                try:
-                    expires_in = int(expires_in)
-                except (ValueError, TypeError):
-                    logger.warning(
-                        f"Invalid expires_in value in refresh: {expires_in}, using default 3600"
-                    )
-                    expires_in = 3600
+            return await fetch()
 
-                if access_token:
-                    token_cache["access_token"] = access_token
-                    token_cache["refresh_token"] = data.get(
-                        "refresh_token", token_cache["refresh_token"]
-                    )
-                    token_cache["expires_at"] = datetime.now() + timedelta(
-                        seconds=expires_in - 300
-                    )
-                    _save_token_cache(token_cache)
 
-                    logger.info("Token refreshed successfully")
-                    return access_token
+async def get_auth_token() -> Optional[str]:
+    """
+    Get the authentication token for the RDP API with caching to avoid unnecessary re-authentication
+    """
+    return await _get_or_fetch_token(_fetch_auth_token)
 
-            # If refresh fails, fall back to getting a new token
-            logger.info("Token refresh failed, getting new token")
-            return await get_auth_token()
 
-        except Exception as e:
-            logger.error(f"Error refreshing token: {e}")
-            # Fall back to getting a new token
-            return await get_auth_token()
+async def refresh_auth_token() -> Optional[str]:
+    """
+    Refresh the authentication token using the refresh token if available
+    """
+    async with _get_token_lock():
+        async with _token_store.lock():
+            _token_store.load()
+            return await _fetch_refreshed_token()
 
 
 async def get_valid_token() -> Optional[str]:
     """
-    Get a valid authentication token, using cache, refresh, or new authentication as needed
+    Get a valid authentication token, using cache, refresh, or new authentication as needed.
+
+    Only one refresh is in flight at a time; concurrent callers wait for it and reuse its result.
     """
     token_cache = _get_token_cache()
-    
-    # Check if we have a valid cached token
-    if (
-        token_cache["access_token"]
-        and token_cache["expires_at"]
-        and datetime.now() < token_cache["expires_at"]
-    ):
-        logger.info("Using cached auth token")
+
+    # Fast path: valid in-memory token, no locking needed
+    if _is_token_valid(token_cache):
+        logger.debug("Using cached auth token")
         return token_cache["access_token"]
 
-    # Check if token is expired but we have a refresh token
-    if token_cache["refresh_token"]:
-        return await refresh_auth_token()
+    # Refresh when we have a refresh token, otherwise get a new token
+    return await _get_or_fetch_token(_fetch_refreshed_token)
+
+
+async def _invalidate_token(rejected_token: str):
+    """
+    Drop the stored access token if it is still the one the server rejected, so that
+    concurrent 401s trigger a single re-authentication
+    """
+    async with _get_token_lock():
+        async with _token_store.lock():
+            token_cache = _token_store.load(force=True)
+            if token_cache["access_token"] == rejected_token:
+                clear_token_cache()
+
+
+def _endpoint_key(url: str) -> str:
+    """Group URLs by API endpoint, e.g. all /data/news/v1/stories/{id} requests share one key"""
+    parts = urlsplit(url)
+    return parts.netloc + "/".join(parts.path.split("/")[:5])
+
+
+def _get_circuit_breaker(url: str) -> CircuitBreaker:
+    key = _endpoint_key(url)
+    if key not in _circuit_breakers:
+        _circuit_breakers[key] = CircuitBreaker(
+            key,
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=BREAKER_RESET_TIMEOUT,
+        )
+    return _circuit_breakers[key]
+
+
+def get_rate_limiter(url: str) -> Optional[TokenBucket]:
+    """Get the rate limiter for the API endpoint of url, if it is rate limited"""
+    path = urlsplit(url).path
+    for prefix, limiter in _rate_limiters.items():
+        if path.startswith(prefix):
+            return limiter
+    return None
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), if present"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
 
-    # Otherwise get a new token
-    return await get_auth_token()
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(RETRY_BACKOFF_BASE * 2**attempt, RETRY_BACKOFF_MAX))
+
+
+async def _send_request(
+    client: httpx.AsyncClient, method: str, url: str, stream: bool = False, **kwargs
+) -> httpx.Response:
+    if stream:
+        return await client.send(client.build_request(method, url, **kwargs), stream=True)
+    if method == "GET":
+        return await client.get(url, **kwargs)
+    elif method == "POST":
+        return await client.post(url, **kwargs)
+    else:
+        raise ValueError(f"Unsupported HTTP method: {method}")
 
 
 async def make_authenticated_request(
-    url: str, method: str = "GET", **kwargs
+    url: str, method: str = "GET", stream: bool = False, **kwargs
 ) -> httpx.Response:
     """
-    Make an authenticated HTTP request with automatic token retry on 401 errors
+    Make an authenticated HTTP request with automatic token retry on 401 errors.
+
+    Idempotent requests are retried on 429, 5xx and connection errors with exponential
+    backoff and jitter, honouring Retry-After. Each endpoint has a circuit breaker that
+    raises CircuitOpenError without sending anything while the endpoint keeps failing,
+    and requests to rate limited endpoints queue until the limiter lets them through.
+
+    With stream=True the body of the returned response is not read yet; the caller reads
+    it (e.g. with aiter_bytes) and must close the response with aclose().
     """
-    auth_token = await get_valid_token()
-    if not auth_token:
-        raise Exception("Unable to authenticate with news service")
-
-    headers = kwargs.get("headers", {})
-    headers.update(
-        {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json",
-            "cache-control": "no-cache",
-        }
-    )
-    kwargs["headers"] = headers
+    method = method.upper()
+    if method not in ("GET", "POST"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    breaker = _get_circuit_breaker(url)
+    breaker.before_request()
+    limiter = get_rate_limiter(url)
+
+    try:
+        auth_token = await get_valid_token()
+        if not auth_token:
+            raise Exception("Unable to authenticate with news service")
+
+        headers = kwargs.get("headers", {})
+        headers.update(
+            {
+                "Authorization": f"Bearer {auth_token}",
+                "Content-Type": "application/json",
+                "cache-control": "no-cache",
+            }
+        )
+        kwargs["headers"] = headers
+
+        client = get_http_client()
+        can_retry = method in IDEMPOTENT_METHODS
+        reauthenticated = False
+        attempt = 0
+
+        while True:
+            if limiter:
+                await limiter.acquire()
+            try:
+                response = await _send_request(client, method, url, stream, **kwargs)
+            except httpx.TransportError as e:
+                if not can_retry or attempt >= MAX_RETRIES:
+                    breaker.record_failure()
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.info(
+                    f"{type(e).__name__} requesting {url}, retrying in {delay:.2f}s"
+                )
+            else:
+                # If we get a 401, clear the cached token and try once more
+                if response.status_code == 401 and not reauthenticated:
+                    logger.info("Received 401, clearing token cache and retrying")
+                    await response.aclose()
+                    await _invalidate_token(auth_token)
+                    reauthenticated = True
+
+                    # Get a fresh token and retry
+                    auth_token = await get_valid_token()
+                    if not auth_token:
+                        raise Exception("Unable to re-authenticate with news service")
+
+                    headers["Authorization"] = f"Bearer {auth_token}"
+                    kwargs["headers"] = headers
+                    continue
+
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or not can_retry
+                    or attempt >= MAX_RETRIES
+                ):
+                    break
+
+                retry_after = _retry_after(response)
+                if retry_after is not None and retry_after > RETRY_AFTER_MAX:
+                    logger.warning(
+                        f"Received {response.status_code} with Retry-After {retry_after:.0f}s, not retrying"
+                    )
+                    break
+                delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+                logger.info(
+                    f"Received {response.status_code} from {url}, retrying in {delay:.2f}s"
+                )
+                await response.aclose()
 
-    async with httpx.AsyncClient() as client:
-        if method.upper() == "GET":
-            response = await client.get(url, **kwargs)
-        elif method.upper() == "POST":
-            response = await client.post(url, **kwargs)
+            attempt += 1
+            await asyncio.sleep(delay)
+    except BaseException:
+        # Failures without an upstream response (e.g. cancellation) don't count against the endpoint
+        breaker.release()
+        raise
+
+    if response.status_code in RETRY_STATUS_CODES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+    return response
+
+
+def get_rate_limiter_info() -> dict:
+    """Get rate limiter state, including queue depth, per endpoint"""
+    return {limiter.name: limiter.info() for limiter in _rate_limiters.values()}
+
+
+def get_circuit_breaker_info() -> dict:
+    """Get circuit breaker state per endpoint (for debugging)"""
+    return {key: breaker.info() for key, breaker in _circuit_breakers.items()}
+
+
+def _next_refresh_delay() -> float:
+    """Seconds until the background refresher should refresh the token"""
+    failures = _refresher_state["consecutive_failures"]
+    if failures:
+        delay = min(
+            TOKEN_REFRESH_BACKOFF_MIN * 2 ** (failures - 1), TOKEN_REFRESH_BACKOFF_MAX
+        )
+        return delay * random.uniform(1 - TOKEN_REFRESH_JITTER, 1 + TOKEN_REFRESH_JITTER)
+
+    token_cache = _get_token_cache()
+    if not token_cache["access_token"] or not token_cache["expires_at"]:
+        return 0.0
+
+    remaining = (token_cache["expires_at"] - datetime.now()).total_seconds()
+    # Refresh early rather than late so the jitter never pushes us past expiry, but a token
+    # that lives no longer than the lead is not refreshed back to back
+    lead = TOKEN_REFRESH_LEAD * random.uniform(1, 1 + 2 * TOKEN_REFRESH_JITTER)
+    return max(remaining - lead, TOKEN_REFRESH_BACKOFF_MIN)
+
+
+async def _refresh_token_ahead(planned_expiry: Optional[datetime]) -> Optional[str]:
+    """Refresh the token for the background refresher unless another process already did"""
+    async with _get_token_lock():
+        async with _token_store.lock():
+            token_cache = _token_store.load()
+            if (
+                planned_expiry
+                and _is_token_valid(token_cache)
+                and token_cache["expires_at"] > planned_expiry
+            ):
+                logger.info("Token already refreshed by another process")
+                return token_cache["access_token"]
+
+            return await _fetch_refreshed_token()
+
+
+async def _token_refresher_loop():
+    """Keep the cached token fresh so tool calls never wait on authentication"""
+    while True:
+        planned_expiry = _get_token_cache()["expires_at"]
+        delay = _next_refresh_delay()
+        _refresher_state["next_refresh_at"] = (
+            datetime.now() + timedelta(seconds=delay)
+        ).isoformat()
+        await asyncio.sleep(delay)
+
+        try:
+            access_token = await _refresh_token_ahead(planned_expiry)
+        except Exception as e:
+            access_token = None
+            _refresher_state["last_error"] = f"{type(e).__name__}: {e}"
+
+        if access_token:
+            _refresher_state["last_refresh_at"] = datetime.now().isoformat()
+            _refresher_state["last_error"] = None
+            _refresher_state["consecutive_failures"] = 0
         else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+            _refresher_state["consecutive_failures"] += 1
+            if not _refresher_state["last_error"]:
+                _refresher_state["last_error"] = "Token refresh failed"
+            logger.warning(
+                f"Background token refresh failed ({_refresher_state['consecutive_failures']} in a row)"
+            )
 
-        # If we get a 401, clear the cached token and try once more
-        if response.status_code == 401:
-            logger.info("Received 401, clearing token cache and retrying")
-            # Clear the cache file
-            clear_token_cache()
 
-            # Get a fresh token and retry
-            auth_token = await get_valid_token()
-            if not auth_token:
-                raise Exception("Unable to re-authenticate with news service")
+def start_token_refresher():
+    """Start the background token refresher on the running event loop (no-op if already running)"""
+    global _refresher_task
+    if _refresher_task is not None and not _refresher_task.done():
+        return
 
-            headers["Authorization"] = f"Bearer {auth_token}"
-            kwargs["headers"] = headers
+    _refresher_state["consecutive_failures"] = 0
+    _refresher_state["last_error"] = None
+    _refresher_task = asyncio.get_running_loop().create_task(_token_refresher_loop())
+    logger.info("Background token refresher started")
 
-            if method.upper() == "GET":
-                response = await client.get(url, **kwargs)
-            elif method.upper() == "POST":
-                response = await client.post(url, **kwargs)
 
-        return response
+async def stop_token_refresher():
+    """Stop the background token refresher if it is running"""
+    global _refresher_task
+    if _refresher_task is None:
+        return
+
+    _refresher_task.cancel()
+    try:
+        await _refresher_task
+    except asyncio.CancelledError:
+        pass
+    _refresher_task = None
+    _refresher_state["next_refresh_at"] = None
+    logger.info("Background token refresher stopped")
 
 
 def clear_token_cache():
     """Clear the token cache (useful for testing or logout)"""
     try:
-        if CACHE_FILE.exists():
-            CACHE_FILE.unlink()
+        _token_store.clear()
         logger.info("Token cache cleared")
     except Exception as e:
         logger.warning(f"Failed to clear token cache: {e}")
@@ -306,5 +686,9 @@ def get_token_info() -> dict:
         "has_access_token": bool(token_cache["access_token"]),
         "has_refresh_token": bool(token_cache["refresh_token"]),
         "expires_at": token_cache["expires_at"].isoformat() if token_cache["expires_at"] else None,
-        "is_valid": (token_cache["expires_at"] and datetime.now() < token_cache["expires_at"]) if token_cache["expires_at"] else False
+        "is_valid": _is_token_valid(token_cache),
+        "refresher": {
+            "running": _refresher_task is not None and not _refresher_task.done(),
+            **_refresher_state,
+        },
     }
@@ -0,0 +1,168 @@
+import os
+import json
+import asyncio
+import logging
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+def _empty_token_cache() -> dict:
+    return {"access_token": None, "expires_at": None, "refresh_token": None}
+
+
+class TokenStore:
+    """
+    In-process token store. Holds the token for a single server process only; use
+    FileTokenStore to share one token between processes.
+    """
+
+    def __init__(self):
+        self._cache = _empty_token_cache()
+
+    def peek(self) -> dict:
+        """Get the token cache held in memory, without touching any backing storage"""
+        return self._cache
+
+    def load(self, force: bool = False) -> dict:
+        """Get the stored token cache"""
+        return self._cache
+
+    def save(self, cache: dict):
+        """Replace the stored token cache"""
+        self._cache = cache
+
+    def clear(self):
+        """Remove the stored token"""
+        self._cache = _empty_token_cache()
+
+    @asynccontextmanager
+    async def lock(self):
+        """Exclusive access to the store while a token is fetched"""
+        yield
+
+
+class FileTokenStore(TokenStore):
+    """
+    Token store shared by all processes using the same file.
+
+    Writes go to a temporary file that is renamed over the cache file, so readers never
+    see a partial token. The file is only re-read when its mtime changes, and lock()
+    takes an advisory lock on a sibling .lock file so that only one process refreshes
+    the token while the others wait and then pick up its result.
+    """
+
+    def __init__(self, path: Path, lock_poll_interval: float = 0.05):
+        super().__init__()
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.lock_poll_interval = lock_poll_interval
+        self._mtime: Optional[int] = None
+        self._loaded = False
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def peek(self) -> dict:
+        """Get the token cache held in memory; the file is only read on first use"""
+        if not self._loaded:
+            return self.load()
+        return self._cache
+
+    def load(self, force: bool = False) -> dict:
+        """Get the token cache, re-reading the file only if it changed since the last load"""
+        mtime = self._stat_mtime()
+        if not force and mtime == self._mtime:
+            return self._cache
+
+        cache = _empty_token_cache()
+        if mtime is not None:
+            try:
+                with open(self.path, "r") as f:
+                    cache.update(json.load(f))
+                # Convert expires_at string back to datetime
+                if cache.get("expires_at"):
+                    cache["expires_at"] = datetime.fromisoformat(cache["expires_at"])
+            except Exception as e:
+                logger.warning(f"Failed to load token cache: {e}")
+                cache = _empty_token_cache()
+
+        self._cache = cache
+        self._mtime = mtime
+        self._loaded = True
+        return cache
+
+    def save(self, cache: dict):
+        """Atomically write the token cache to file"""
+        self._cache = cache
+        try:
+            # Convert datetime to string for JSON serialization
+            cache_to_save = cache.copy()
+            if cache_to_save.get("expires_at"):
+                cache_to_save["expires_at"] = cache_to_save["expires_at"].isoformat()
+
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(cache_to_save, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+            self._mtime = self._stat_mtime()
+            logger.debug(f"Token cache saved to {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to save token cache: {e}")
+
+    def clear(self):
+        """Delete the token cache file"""
+        super().clear()
+        self.path.unlink(missing_ok=True)
+        self._mtime = None
+
+    def _try_lock(self, f) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @asynccontextmanager
+    async def lock(self):
+        """Hold the cross-process lock, polling so waiting never blocks the event loop"""
+        with open(self.lock_path, "a+") as f:
+            while not self._try_lock(f):
+                await asyncio.sleep(self.lock_poll_interval)
+            try:
+                yield
+            finally:
+                self._unlock(f)
@@ -0,0 +1,209 @@
+"""
+Persistent MCP client sessions for the chat application.
+
+MultiServerMCPClient.get_tools() returns tools that open a new session - and for stdio
+servers spawn a new server process - on every tool call. SessionPool instead keeps a
+small number of sessions open for the lifetime of the app, health-checks them with
+pings and restarts a session whose server has died.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+import anyio
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+logger = logging.getLogger(__name__)
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """True for errors meaning the session's connection to the server is gone"""
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(
+        error, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+    )
+
+
+class PersistentSession:
+    """
+    One MCP client session kept open by a background task.
+
+    The task owns the session context (anyio requires it to be entered and exited by the
+    same task), pings the server every health_check_interval seconds and reopens the
+    session with exponential backoff when a ping fails or a restart is requested.
+    """
+
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 10.0,
+        restart_backoff_max: float = 30.0,
+    ):
+        self.client = client
+        self.server_name = server_name
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.restart_backoff_max = restart_backoff_max
+        self.session: Optional[ClientSession] = None
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self._ready = asyncio.Event()
+        self._restart = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.session is not None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def wait_ready(self):
+        await self._ready.wait()
+
+    def request_restart(self):
+        # Stop handing out the session straight away, the owner task reopens it
+        self.session = None
+        self._ready.clear()
+        self._restart.set()
+
+    async def _run(self):
+        backoff = 1.0
+        while True:
+            try:
+                async with self.client.session(self.server_name) as session:
+                    self.session = session
+                    self._restart.clear()
+                    self._ready.set()
+                    backoff = 1.0
+                    logger.info(f"MCP session to '{self.server_name}' open")
+                    await self._health_check(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning(f"MCP session to '{self.server_name}' failed: {self.last_error}")
+            finally:
+                self.session = None
+                self._ready.clear()
+
+            self.restarts += 1
+            logger.info(f"Restarting MCP session to '{self.server_name}' in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.restart_backoff_max)
+
+    async def _health_check(self, session: ClientSession):
+        """Return when the session should be restarted"""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._restart.wait(), timeout=self.health_check_interval
+                )
+                logger.info(f"Restart of MCP session to '{self.server_name}' requested")
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await asyncio.wait_for(session.send_ping(), timeout=self.health_check_timeout)
+            except Exception as e:
+                self.last_error = f"Health check failed: {type(e).__name__}: {e}"
+                logger.warning(f"MCP session to '{self.server_name}': {self.last_error}")
+                return
+
+    def info(self) -> dict:
+        return {
+            "ready": self.ready,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+        }
+
+
+class SessionPool:
+    """
+    A small pool of persistent sessions to one MCP server, used round-robin.
+
+    Provides list_tools() and call_tool() like a ClientSession, so it can be passed to
+    langchain_mcp_adapters' load_mcp_tools(). A call that fails because its session's
+    connection died restarts that session and is retried once on another session.
+    """
+
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        size: int = 1,
+        ready_timeout: float = 60.0,
+        **session_kwargs: Any,
+    ):
+        self.server_name = server_name
+        self.ready_timeout = ready_timeout
+        self.sessions = [
+            PersistentSession(client, server_name, **session_kwargs)
+            for _ in range(max(1, size))
+        ]
+        self._next = 0
+
+    async def start(self):
+        """Open all sessions and wait for at least one to be ready"""
+        for session in self.sessions:
+            session.start()
+        await self._get_session()
+
+    async def stop(self):
+        await asyncio.gather(*(session.stop() for session in self.sessions))
+
+    async def _get_session(self) -> PersistentSession:
+        for _ in range(len(self.sessions)):
+            session = self.sessions[self._next]
+            self._next = (self._next + 1) % len(self.sessions)
+            if session.ready:
+                return session
+
+        # No session is ready (e.g. all restarting), wait for the first one that is
+        waiters = [asyncio.create_task(session.wait_ready()) for session in self.sessions]
+        try:
+            await asyncio.wait(
+                waiters, timeout=self.ready_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        for session in self.sessions:
+            if session.ready:
+                return session
+        raise RuntimeError(f"MCP server '{self.server_name}' is not available")
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        for attempt in range(2):
+            session = await self._get_session()
+            try:
+                return await getattr(session.session, method)(*args, **kwargs)
+            except Exception as e:
+                if attempt or not _is_connection_error(e):
+                    raise
+                logger.warning(f"MCP session to '{self.server_name}' lost during {method}, retrying")
+                session.request_restart()
+
+    async def list_tools(self, *args: Any, **kwargs: Any):
+        return await self._call("list_tools", *args, **kwargs)
+
+    async def call_tool(self, *args: Any, **kwargs: Any):
+        return await self._call("call_tool", *args, **kwargs)
+
+    def info(self) -> list[dict]:
+        return [session.info() for session in self.sessions]
@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import asyncio
+import importlib
+from typing import Any, Optional
+
+import httpx
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from starlette.testclient import TestClient
+
+# Add the project root to path to import chat_app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LLM_LATENCY = 0.5
+
+# Number of messages the model was sent on each call
+prompt_sizes = []
+
+
+class SlowChatModel(BaseChatModel):
+    """Chat model that takes LLM_LATENCY seconds to answer, blocking in the sync path"""
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        return self
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="done"))])
+
+    def _generate(self, messages, stop: Optional[list[str]] = None, run_manager=None, **kwargs):
+        time.sleep(LLM_LATENCY)
+        return self._result()
+
+    async def _agenerate(self, messages, stop: Optional[list[str]] = None, run_manager=None, **kwargs):
+        prompt_sizes.append(len(messages))
+        await asyncio.sleep(LLM_LATENCY)
+        return self._result()
+
+    async def _astream(self, messages, stop: Optional[list[str]] = None, run_manager=None, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        for token in ["do", "ne"]:
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+@pytest.fixture
+def chat_app(monkeypatch):
+    import llm
+
+    monkeypatch.setattr(llm, "get_default_chat_llm", lambda: SlowChatModel())
+    sys.modules.pop("chat_app", None)
+    module = importlib.import_module("chat_app")
+
+    async def no_news_tools():
+        return []
+
+    monkeypatch.setattr(module, "get_news_tools", no_news_tools)
+    yield module
+    sys.modules.pop("chat_app", None)
+
+
+def test_concurrent_chat_requests_do_not_block_each_other(chat_app):
+    # More requests than the default thread pool (at most 32 workers) that LangGraph runs
+    # sync nodes in, so a blocking LLM call would make them queue
+    requests = 100
+
+    async def run():
+        await chat_app.initialize_app()
+        transport = httpx.ASGITransport(app=chat_app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start = time.monotonic()
+            responses = await asyncio.gather(
+                *(
+                    client.post("/chat", json={"message": f"question {i}"}, timeout=30)
+                    for i in range(requests)
+                )
+            )
+            return time.monotonic() - start, responses
+
+    elapsed, responses = asyncio.run(run())
+
+    assert all(r.status_code == 200 for r in responses)
+    assert all(r.json()["response"] == "done" for r in responses)
+    # Each request started its own thread
+    assert len({r.json()["thread_id"] for r in responses}) == requests
+    # Roughly the time of one request; queued behind the thread pool it takes 4x as long
+    assert elapsed < 2 * LLM_LATENCY
+
+
+def test_chat_thread_keeps_history(chat_app):
+    async def run():
+        await chat_app.initialize_app()
+        transport = httpx.ASGITransport(app=chat_app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = (await client.post("/chat", json={"message": "first"})).json()
+            second = (
+                await client.post(
+                    "/chat", json={"message": "second", "thread_id": first["thread_id"]}
+                )
+            ).json()
+            other = (await client.post("/chat", json={"message": "other"})).json()
+        await chat_app.close_app()
+        return first, second, other
+
+    prompt_sizes.clear()
+    first, second, other = asyncio.run(run())
+
+    assert second["thread_id"] == first["thread_id"]
+    assert other["thread_id"] != first["thread_id"]
+    # System message + question, then the first turn's question and answer are included
+    assert prompt_sizes == [2, 4, 2]
+
+
+def test_websocket_streams_tokens_before_final_response(chat_app):
+    asyncio.run(chat_app.initialize_app())
+
+    with TestClient(chat_app.app).websocket_connect("/ws") as websocket:
+        websocket.send_json({"message": "question"})
+        received = []
+        while not received or received[-1]["type"] not in ("final_complete", "error"):
+            received.append(websocket.receive_json())
+
+    types = [message["type"] for message in received]
+    tokens = [message["content"] for message in received if message["type"] == "token"]
+    assert tokens == ["do", "ne"]
+    assert types.index("token") < types.index("final_complete")
+    assert received[-1]["response"] == "done"
@@ -0,0 +1,122 @@
+import os
+import sys
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+from langgraph.graph import START, StateGraph
+
+# Add the project root to path to import chat_history
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chat_history import BoundedMemorySaver, ChatState, HistoryManager, open_checkpointer
+
+
+def turn(n: int, tool_result: str = "result") -> list:
+    return [
+        HumanMessage(content=f"question {n}", id=f"h{n}"),
+        AIMessage(
+            content="",
+            id=f"a{n}",
+            tool_calls=[{"name": "get_headlines", "args": {}, "id": f"call{n}"}],
+        ),
+        ToolMessage(content=tool_result, tool_call_id=f"call{n}", id=f"t{n}"),
+        AIMessage(content=f"answer {n}", id=f"r{n}"),
+    ]
+
+
+class FakeSummaryLLM:
+    def __init__(self):
+        self.transcripts = []
+
+    async def ainvoke(self, messages):
+        self.transcripts.append(messages[-1].content)
+        return AIMessage(content="earlier summary")
+
+
+def test_history_within_budget_is_unchanged():
+    history = HistoryManager(token_budget=10000, tool_result_tokens=1000)
+    messages = turn(1) + turn(2) + [HumanMessage(content="question 3", id="h3")]
+    assert asyncio.run(history.compact({"messages": messages})) == {}
+
+
+def test_earlier_tool_results_are_truncated():
+    history = HistoryManager(token_budget=10000, tool_result_tokens=10)
+    messages = turn(1, "x" * 1000) + turn(2, "y" * 1000)
+    updates = asyncio.run(history.compact({"messages": messages}))
+
+    (truncated,) = updates["messages"]
+    # Only the earlier turn's tool result, replaced under its own ID
+    assert truncated.id == "t1"
+    assert truncated.content.startswith("x" * 40)
+    assert "960 characters of an earlier tool result removed" in truncated.content
+
+    # A later turn leaves the truncated result alone
+    messages = [truncated if m.id == "t1" else m for m in messages] + turn(3, "z" * 1000)
+    (truncated,) = asyncio.run(history.compact({"messages": messages}))["messages"]
+    assert truncated.id == "t2"
+    assert "960 characters of an earlier tool result removed" in truncated.content
+    messages = [truncated if m.id == "t2" else m for m in messages]
+    assert asyncio.run(history.compact({"messages": messages})) == {}
+
+
+def test_oldest_turns_dropped_to_budget_and_summarized():
+    summary_llm = FakeSummaryLLM()
+    history = HistoryManager(token_budget=300, tool_result_tokens=0, summary_llm=summary_llm)
+    messages = turn(1, "a" * 400) + turn(2, "b" * 400) + turn(3, "c" * 400) + turn(4, "d" * 400)
+    updates = asyncio.run(history.compact({"messages": messages}))
+
+    removed = [m.id for m in updates["messages"] if isinstance(m, RemoveMessage)]
+    assert removed == ["h1", "a1", "t1", "r1", "h2", "a2", "t2", "r2"]
+    assert updates["summary"] == "earlier summary"
+    assert "question 1" in summary_llm.transcripts[0]
+
+
+def test_current_turn_is_never_dropped():
+    history = HistoryManager(token_budget=10, tool_result_tokens=0)
+    messages = turn(1) + turn(2, "z" * 1000)
+    updates = asyncio.run(history.compact({"messages": messages}))
+
+    removed = [m.id for m in updates["messages"] if isinstance(m, RemoveMessage)]
+    assert removed == ["h1", "a1", "t1", "r1"]
+
+
+def test_open_checkpointer(tmp_path):
+    async def run(kind):
+        async with AsyncExitStack() as stack:
+            return type(await open_checkpointer(stack, kind, str(tmp_path / "threads.sqlite")))
+
+    assert asyncio.run(run("memory")) is BoundedMemorySaver
+    pytest.importorskip("langgraph.checkpoint.sqlite")
+    assert asyncio.run(run("sqlite")).__name__ == "AsyncSqliteSaver"
+
+
+def test_memory_checkpointer_is_bounded():
+    async def answer(state):
+        return {"messages": [AIMessage(content=f"answer {len(state['messages'])}")]}
+
+    builder = StateGraph(ChatState)
+    builder.add_node("answer", answer)
+    builder.add_edge(START, "answer")
+    checkpointer = BoundedMemorySaver(max_threads=2)
+    graph = builder.compile(checkpointer=checkpointer)
+
+    async def ask(thread_id):
+        config = {"configurable": {"thread_id": thread_id}}
+        return await graph.ainvoke({"messages": [HumanMessage(content="question")]}, config)
+
+    async def run():
+        for _ in range(3):
+            await ask("a")
+        await ask("b")
+        await ask("a")
+        # A third thread evicts the least recently used one
+        await ask("c")
+        return (await ask("a"))["messages"]
+
+    messages = asyncio.run(run())
+    assert len(messages) == 10
+    assert set(checkpointer.storage) == {"a", "c"}
+    assert all(len(checkpoints) == 1 for checkpoints in checkpointer.storage["a"].values())
+    # Only the channel values of the latest checkpoint are kept
+    assert len([key for key in checkpointer.blobs if key[0] == "a"]) <= len(ChatState.__annotations__) + 2
@@ -0,0 +1,114 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+# Add the MCP server directory to path to import the coalescer
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers")
+)
+from coalescer import RequestCoalescer
+
+
+def test_concurrent_callers_share_one_call():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return f"body of {key}"
+
+    async def main():
+        return await asyncio.gather(
+            *[coalescer.run("a", lambda: fetch("a")) for _ in range(5)],
+            coalescer.run("b", lambda: fetch("b")),
+        )
+
+    results = asyncio.run(main())
+    assert results == ["body of a"] * 5 + ["body of b"]
+    assert calls == ["a", "b"]
+    assert coalescer.info() == {"in_flight": 0, "started": 2, "coalesced": 4}
+
+
+def test_cancelling_one_caller_keeps_shared_call():
+    coalescer = RequestCoalescer()
+    finished = []
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return "body"
+
+    async def main():
+        first = asyncio.create_task(coalescer.run("a", fetch))
+        second = asyncio.create_task(coalescer.run("a", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "body"
+    assert finished == [True]
+
+
+def test_errors_reach_every_caller():
+    coalescer = RequestCoalescer()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def main():
+        return await asyncio.gather(
+            coalescer.run("a", fetch), coalescer.run("a", fetch), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert coalescer.info()["in_flight"] == 0
+
+
+def test_call_is_cancelled_when_every_caller_is():
+    coalescer = RequestCoalescer()
+    finished = []
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    async def main():
+        caller = asyncio.create_task(coalescer.run("a", fetch))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert finished == []
+    assert coalescer.info()["in_flight"] == 0
+
+
+def test_caller_after_cancellation_starts_a_new_call():
+    coalescer = RequestCoalescer()
+    started = []
+
+    async def fetch():
+        started.append(True)
+        await asyncio.sleep(0.05)
+        return "body"
+
+    async def main():
+        first = asyncio.create_task(coalescer.run("a", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        # Join before the cancelled call has finished
+        second = asyncio.create_task(coalescer.run("a", fetch))
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "body"
+    assert started == [True, True]
+    assert coalescer.info() == {"in_flight": 0, "started": 2, "coalesced": 0}
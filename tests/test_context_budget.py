@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+# Add the project root to path to import context_budget
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from context_budget import (
+    ContextBudget,
+    estimate_tokens,
+    html_to_text,
+    lead,
+    reduce_result,
+    strip_boilerplate,
+    tokens_saved,
+)
+
+STORY_HTML = (
+    "<html><head><style>p {margin: 0}</style></head><body>"
+    "<p>LONDON (Reuters) - Tesla shares rose 5% on Monday after deliveries beat forecasts.</p>"
+    "<p>Analysts had expected a weaker quarter &amp; lower margins.</p>"
+    "<p>(Reporting by Jane Doe; Editing by John Smith)</p>"
+    "<p>((jane.doe@thomsonreuters.com; +44 20 7542 0000))</p>"
+    "<p>Our Standards: The Thomson Reuters Trust Principles.</p>"
+    "</body></html>"
+)
+
+
+def story_result(paragraphs: int = 1) -> str:
+    body = STORY_HTML.replace("</body>", "<p>More detail on the quarter.</p>" * paragraphs + "</body>")
+    return json.dumps({"story_id": "n1", "headline": "Tesla rises", "content": body})
+
+
+def test_html_to_text_and_boilerplate():
+    text = strip_boilerplate(html_to_text(STORY_HTML))
+    assert text == (
+        "LONDON (Reuters) - Tesla shares rose 5% on Monday after deliveries beat forecasts.\n"
+        "Analysts had expected a weaker quarter & lower margins."
+    )
+
+
+def test_lead_keeps_whole_paragraphs():
+    text = "First paragraph.\nSecond paragraph.\nThird paragraph."
+    assert lead(text, 100) == text
+    assert lead(text, 9) == "First paragraph.\nSecond paragraph.\n[... 17 more characters]"
+    # A first paragraph over the cap is cut at a sentence
+    assert lead("One. Two. Three. Four.", 3) == "One. Two.\n[... 13 more characters]"
+
+
+def test_reduce_result_keeps_json_and_caps_content():
+    reduced = json.loads(reduce_result(story_result(200), 100))
+    assert reduced["headline"] == "Tesla rises"
+    assert reduced["content"].startswith("LONDON (Reuters) - Tesla shares rose 5%")
+    assert "<p>" not in reduced["content"]
+    assert reduced["content"].endswith("more characters]")
+    assert estimate_tokens(json.dumps(reduced)) <= 110
+
+
+def test_reduce_result_shortens_headline_lists():
+    result = {
+        "headlines": [
+            {
+                "story_id": f"urn:newsml:reuters.com:20250610:nX{i:07d}",
+                "headline": f"Acme Corp shares move on update number {i}",
+                "publication_date": "2025-06-10T10:00:00.000Z",
+                "urgency": 3,
+                "source": "NS:RTRS",
+            }
+            for i in range(300)
+        ],
+        "next_cursor": "abc",
+    }
+    text = json.dumps(result)
+    assert estimate_tokens(text) > 10000
+
+    reduced = json.loads(reduce_result(text, 2000))
+    assert estimate_tokens(json.dumps(reduced, ensure_ascii=False)) <= 2000
+    assert reduced["headlines"] == result["headlines"][: len(reduced["headlines"])]
+    assert reduced["headlines_omitted"] == 300 - len(reduced["headlines"])
+    # The cursor would skip the omitted headlines
+    assert reduced["next_cursor"] is None
+    assert "smaller limit" in reduced["next_cursor_note"]
+
+    # Results within the cap keep their cursor
+    short = dict(result, headlines=result["headlines"][:10])
+    assert json.loads(reduce_result(json.dumps(short), 2000)) == short
+
+    # Lists at the top level end with a count of the dropped items
+    reduced = json.loads(reduce_result(json.dumps(result["headlines"]), 500))
+    assert reduced[-1]["omitted"] == 300 - len(reduced) + 1
+
+
+def test_budget_node_caps_results_per_turn():
+    budget = ContextBudget(result_tokens=2000, turn_tokens=300)
+    tool_call = AIMessage(
+        content="",
+        id="a1",
+        tool_calls=[
+            {"name": "get_news_story", "args": {}, "id": "c1"},
+            {"name": "get_news_story", "args": {}, "id": "c2"},
+        ],
+    )
+    messages = [
+        HumanMessage(content="question", id="h1"),
+        tool_call,
+        ToolMessage(content=story_result(200), tool_call_id="c1", id="t1"),
+        ToolMessage(content="Error: story not found", tool_call_id="c2", id="t2", status="error"),
+    ]
+    updates = asyncio.run(budget.reduce({"messages": messages}))
+
+    reduced, error = updates["messages"]
+    assert reduced.id == "t1" and error.id == "t2"
+    # Two new results share the turn's 300 tokens
+    assert estimate_tokens(reduced.content) <= 160
+    assert error.content == "Error: story not found"
+    assert tokens_saved(updates["messages"]) > 1000
+
+    # Already reduced results are left alone
+    assert asyncio.run(budget.reduce({"messages": messages[:2] + updates["messages"]})) == {}
@@ -0,0 +1,79 @@
+import os
+import sys
+import asyncio
+import textwrap
+
+# Add the project root to path to import mcp_session
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp_session import SessionPool
+
+SERVER = textwrap.dedent(
+    """
+    import os
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    def pid() -> str:
+        return str(os.getpid())
+
+    @mcp.tool()
+    def crash() -> str:
+        os._exit(1)
+
+    mcp.run(transport="stdio")
+    """
+)
+
+
+def make_pool(tmp_path, **kwargs):
+    server_path = tmp_path / "server.py"
+    server_path.write_text(SERVER)
+    client = MultiServerMCPClient(
+        {
+            "test": {
+                "command": sys.executable,
+                "args": [str(server_path)],
+                "transport": "stdio",
+            }
+        }
+    )
+    return SessionPool(client, "test", **kwargs)
+
+
+def test_tool_calls_reuse_one_server_process(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path)
+        await pool.start()
+        try:
+            tools = {tool.name: tool for tool in await load_mcp_tools(pool)}
+            return [await tools["pid"].ainvoke({}) for _ in range(3)]
+        finally:
+            await pool.stop()
+
+    pids = asyncio.run(main())
+    assert len(set(pids)) == 1
+
+
+def test_session_restarts_after_server_dies(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path, health_check_interval=0.2)
+        await pool.start()
+        try:
+            tools = {tool.name: tool for tool in await load_mcp_tools(pool)}
+            first_pid = await tools["pid"].ainvoke({})
+            try:
+                await tools["crash"].ainvoke({})
+            except Exception:
+                pass
+            second_pid = await asyncio.wait_for(tools["pid"].ainvoke({}), timeout=30)
+            return first_pid, second_pid, pool.info()
+        finally:
+            await pool.stop()
+
+    first_pid, second_pid, info = asyncio.run(main())
+    assert first_pid != second_pid
+    assert info[0]["restarts"] >= 1
@@ -0,0 +1,74 @@
+import os
+import sys
+import asyncio
+
+import httpx
+
+# Add benchmarks to path to import the mock server and benchmark driver
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from bench_news_tools import percentile
+from mock_rdp_server import MockConfig, create_app
+
+TOKEN_FORM = {"grant_type": "password", "username": "u", "password": "p", "client_id": "c"}
+
+
+def run(config: MockConfig, requests):
+    async def main():
+        transport = httpx.ASGITransport(app=create_app(config))
+        async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+            token = (await client.post("/auth/oauth2/v1/token", data=TOKEN_FORM)).json()
+            headers = {"Authorization": f"Bearer {token['access_token']}"}
+            return token, await requests(client, headers)
+
+    return asyncio.run(main())
+
+
+def test_headline_pages_and_stories():
+    async def requests(client, headers):
+        first = (await client.get("/data/news/v1/headlines", params={"query": "Tesla", "limit": 100}, headers=headers)).json()
+        second = (await client.get("/data/news/v1/headlines", params={"cursor": first["meta"]["next"]}, headers=headers)).json()
+        story = (await client.get(f"/data/news/v1/stories/{first['data'][0]['storyId']}", headers=headers)).json()
+        return first, second, story
+
+    token, (first, second, story) = run(MockConfig(headlines_total=110, story_kb=5), requests)
+
+    assert token["expires_in"] == "600"
+    assert len(first["data"]) == 100
+    assert first["data"][0]["newsItem"]["itemMeta"]["title"][0]["$"] == "Tesla headline 0"
+    assert len(second["data"]) == 10 and "next" not in second["meta"]
+    inline = story["newsItem"]["contentSet"]["inlineData"][0]
+    assert inline["_contenttype"] == "text/html"
+    assert 5 * 1024 <= len(inline["$"]) < 5 * 1024 + 300
+
+
+def test_failure_injection():
+    async def requests(client, headers):
+        no_token = await client.get("/data/news/v1/stories/n1")
+        limited = await client.get("/data/news/v1/stories/n1", headers=headers)
+        stats = (await client.get("/mock/stats")).json()
+        return no_token, limited, stats
+
+    _, (no_token, limited, stats) = run(MockConfig(rate_limit_rate=1.0, retry_after=2), requests)
+
+    assert no_token.status_code == 401
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "2"
+    assert stats == {"token 200": 1, "stories 401": 1, "stories 429": 1}
+
+
+def test_injected_401_revokes_token():
+    async def requests(client, headers):
+        return [
+            (await client.get("/data/news/v1/headlines", params={"query": "x"}, headers=headers)).status_code
+            for _ in range(2)
+        ]
+
+    _, statuses = run(MockConfig(unauthorized_rate=1.0), requests)
+    assert statuses == [401, 401]
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert round(percentile(values, 99), 2) == 99.01
+    assert percentile([3.0], 95) == 3.0
@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+# Add the MCP server directory to path to import the news cache
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers")
+)
+from news_cache import StoryCache, TTLCache, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  Tesla   last 5 days ") == "Tesla last 5 days"
+    assert normalize_query('"Debt" and not CMPNY') == '"Debt" AND NOT CMPNY'
+    assert normalize_query('""electric  car"" Or " EV "') == '"electric car" OR "EV"'
+    assert normalize_query('MSFT.O "" and') == "MSFT.O AND"
+    # Operators inside quotes are free text and keep their case
+    assert normalize_query('"rock and roll"') == '"rock and roll"'
+
+
+def test_ttl_expiry_and_counters():
+    cache = TTLCache(max_entries=10, ttl=0.05)
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 2
+    assert cache.info()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache(ttl=0)
+    cache.set("a", "1")
+    assert cache.get("a") is None
+
+
+def test_story_cache_persists_and_revalidates(tmp_path):
+    path = tmp_path / "stories.sqlite3"
+    cache = StoryCache(path)
+    cache.set("urn:1", "2025-06-10T10:00:00Z", '{"story_id": "urn:1"}')
+    cache.close()
+
+    # Survives a restart
+    cache = StoryCache(path)
+    assert cache.get("urn:1") == '{"story_id": "urn:1"}'
+
+    # Same version keeps the entry, a newer one drops it
+    cache.revalidate("urn:1", "2025-06-10T10:00:00Z")
+    assert cache.get("urn:1") is not None
+    cache.revalidate("urn:1", "2025-06-10T11:00:00Z")
+    assert cache.get("urn:1") is None
+    assert cache.info()["hits"] == 2
+    assert cache.info()["misses"] == 1
+
+
+def test_story_cache_evicts_least_recently_read(tmp_path):
+    cache = StoryCache(tmp_path / "stories.sqlite3", max_bytes=250)
+    for story_id in ("a", "b"):
+        cache.set(story_id, None, "x" * 100)
+        time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", None, "x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.info()["size_bytes"] <= 250
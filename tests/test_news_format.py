@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add mcp-servers to path to import news_format
+sys.path.append(os.path.join(ROOT, "mcp-servers"))
+import news_format
+from news_format import (
+    check_output_options,
+    extract_headline,
+    extract_rics,
+    extract_story,
+    html_to_text,
+    shape_headline,
+    shape_story,
+)
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(ROOT, "benchmarks", "fixtures", f"{name}.json")) as f:
+        return json.load(f)
+
+STORY = {
+    "story_id": "urn:newsml:reuters.com:20250610:nL1N3SE0D8",
+    "headline": "Tesla deliveries beat forecasts",
+    "publication_date": "2025-06-10T10:00:00Z",
+    "urgency": 3,
+    "content_type": "text/html",
+    "content": "<html><body><p>Tesla shares rose &amp; analysts cheered.</p><p>More detail.</p></body></html>",
+    "source": "NS:RTRS",
+}
+
+
+def test_story_profiles():
+    assert shape_story(STORY, "minimal") == {
+        "story_id": STORY["story_id"],
+        "headline": STORY["headline"],
+        "publication_date": STORY["publication_date"],
+        "source": "NS:RTRS",
+    }
+    standard = shape_story(STORY, "standard")
+    assert standard["content"] == "Tesla shares rose & analysts cheered.\nMore detail."
+    assert standard["urgency"] == 3
+    assert shape_story(STORY, "full") == STORY
+
+
+def test_story_max_chars():
+    assert shape_story(STORY, "standard", max_chars=11)["content"] == "Tesla share... [39 more characters]"
+    assert shape_story(STORY, "standard", max_chars=1000)["content"].endswith("More detail.")
+    # Non-HTML content is left as it is
+    image = {**STORY, "content_type": "image/jpeg", "content": "Image content (binary data not included)"}
+    assert shape_story(image, "standard")["content"] == image["content"]
+
+
+def test_story_text_is_converted_once_per_version(monkeypatch):
+    conversions = []
+
+    def convert(html):
+        conversions.append(html)
+        return html_to_text(html)
+
+    monkeypatch.setattr(news_format, "html_to_text", convert)
+    monkeypatch.setattr(news_format, "_story_texts", news_format._TextCache(max_chars=1000))
+    for _ in range(3):
+        assert shape_story(STORY, "standard")["content"].startswith("Tesla shares rose")
+    assert len(conversions) == 1
+
+    updated = {**STORY, "publication_date": "2025-06-10T11:00:00Z", "content": "<p>Updated.</p>"}
+    assert shape_story(updated, "standard")["content"] == "Updated."
+    assert shape_story(STORY, "standard", max_chars=5)["content"].startswith("Tesla")
+    assert len(conversions) == 2
+
+    # Texts over the cache size are converted every time
+    news_format._story_texts.max_chars = 10
+    long_story = {**STORY, "story_id": "other"}
+    shape_story(long_story, "standard")
+    shape_story(long_story, "standard")
+    assert len(conversions) == 4
+
+
+def test_headline_profiles():
+    headline = {
+        "story_id": "id",
+        "headline": "Tesla rises",
+        "publication_date": "2025-06-10T10:00:00Z",
+        "urgency": 1,
+        "source": "NS:RTRS",
+        "language": "en",
+    }
+    assert shape_headline(headline, "minimal") == {"story_id": "id", "headline": "Tesla rises"}
+    assert shape_headline(headline, "standard") == {
+        "story_id": "id",
+        "headline": "Tesla rises",
+        "publication_date": "2025-06-10T10:00:00Z",
+    }
+    assert shape_headline(headline, "full") == headline
+
+
+def test_html_to_text_skips_style_and_blank_lines():
+    html = "<html><head><style>p {}</style></head><body><p> a  b </p><p></p><div>c<br>d</div></body></html>"
+    assert html_to_text(html) == "a b\nc\nd"
+
+
+def test_check_output_options():
+    check_output_options("minimal", 100)
+    with pytest.raises(ValueError):
+        check_output_options("compact", None)
+    with pytest.raises(ValueError):
+        check_output_options("full", 0)
+
+
+def test_extract_headline_from_recorded_page():
+    page = load_fixture("headlines_small")
+    headline = extract_headline(page["data"][0])
+    assert headline == {
+        "story_id": "urn:newsml:reuters.com:20250610:nX0000000",
+        "headline": page["data"][0]["newsItem"]["itemMeta"]["title"][0]["$"],
+        "publication_date": "2025-06-10T23:59:00.000Z",
+        "urgency": 1,
+        "source": "NS:RTRS",
+        "language": "en",
+    }
+    # Missing metadata leaves fields empty
+    assert extract_headline({"storyId": "id", "newsItem": {}}) == {
+        "story_id": "id",
+        "headline": "",
+        "publication_date": "",
+        "urgency": "",
+        "source": "",
+        "language": "",
+    }
+
+
+def test_extract_story_from_recorded_story():
+    story = extract_story("id", load_fixture("story_typical"))
+    assert story["headline"] == "Nrth Corp orders margin as plant plant - source"
+    assert story["publication_date"] == "2025-06-10T23:57:14.000Z"
+    assert story["urgency"] == 3
+    assert story["source"] == "NS:RTRS"
+    assert story["content_type"] == "text/html"
+    assert story["content"].startswith('<div class="storyContent"')
+
+
+def test_extract_story_leaves_out_image_data():
+    data = load_fixture("story_small")
+    data["newsItem"]["contentSet"]["inlineData"] = [{"_contenttype": "image/jpeg", "$": "/9j/4AAQ"}]
+    story = extract_story("id", data)
+    assert story["content_type"] == "image/jpeg"
+    assert story["content"] == "Image content (binary data not included)"
+
+
+def test_extract_rics():
+    item = load_fixture("headlines_small")["data"][0]
+    assert extract_rics(item) == ["ACME.N"]
+    assert extract_rics(load_fixture("story_small")) == ["GLBX.O"]
+    assert extract_rics({"storyId": "x"}) == []
+
+
+def test_html_to_text_breaks_lists_and_quotes():
+    html = "<title>Page</title><p>Points:<ul><li>one</li><li>two</li></ul></p><blockquote>quoted</blockquote>after"
+    assert html_to_text(html) == "Points:\none\ntwo\nquoted\nafter"
@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add mcp-servers to path to import news_index
+sys.path.append(os.path.join(ROOT, "mcp-servers"))
+from news_format import extract_headline, extract_rics, extract_story
+from news_index import NewsIndex, date_bound, match_query
+
+STORY_ID = "urn:newsml:reuters.com:20250610:nX0000001"
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(ROOT, "benchmarks", "fixtures", f"{name}.json")) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = NewsIndex(tmp_path / "index.sqlite3")
+    page = load_fixture("headlines_small")
+    index.add_headlines(
+        [extract_headline(item) for item in page["data"]],
+        [extract_rics(item) for item in page["data"]],
+    )
+    yield index
+    index.close()
+
+
+def story_ids(results: list[dict]) -> list[str]:
+    return [result["story_id"] for result in results]
+
+
+def test_search_headlines_by_word_and_ric(index):
+    results = index.search("acme")
+    assert story_ids(results) == [
+        "urn:newsml:reuters.com:20250610:nX0000000",
+        "urn:newsml:reuters.com:20250610:nX0000008",
+    ]
+    assert results[0]["rics"] == ["ACME.N"]
+    assert results[0]["urgency"] == 1
+    assert results[0]["story_indexed"] is False
+
+    assert story_ids(index.search("GLBX.O")) == story_ids(index.search("glbx"))
+    assert story_ids(index.search("acme NOT merger")) == ["urn:newsml:reuters.com:20250610:nX0000000"]
+    assert len(index.search("acme OR glbx", limit=3)) == 3
+
+
+def test_story_body_is_indexed_and_kept(index):
+    data = load_fixture("story_small")
+    index.add_story(extract_story(STORY_ID, data), extract_rics(data))
+    results = index.search('"bid demand orders"')
+    assert story_ids(results) == [STORY_ID]
+    assert results[0]["story_indexed"] is True
+    assert "demand orders" in results[0]["snippet"]
+    # The style sheet is not indexed as text
+    assert index.search("inherit") == []
+
+    # Listing the same version of the headline again keeps the body
+    page = load_fixture("headlines_small")
+    index.add_headlines([extract_headline(page["data"][1])], [extract_rics(page["data"][1])])
+    assert story_ids(index.search('"bid demand orders"')) == [STORY_ID]
+    assert index.info()["stories"] == 1
+
+
+def test_headline_matches_rank_above_body_matches(index):
+    story = {
+        "story_id": "urn:newsml:reuters.com:20250610:nX0000099",
+        "headline": "Markets wrap",
+        "publication_date": "2025-06-10T12:00:00.000Z",
+        "urgency": 3,
+        "content_type": "text/plain",
+        "content": "Separately, Kaim Corp was little changed. " + "Stocks fell on the day. " * 20,
+        "source": "NS:RTRS",
+    }
+    index.add_story(story, [])
+    assert story_ids(index.search("kaim")) == [
+        "urn:newsml:reuters.com:20250610:nX0000004",
+        "urn:newsml:reuters.com:20250610:nX0000099",
+    ]
+
+
+def test_date_filter(index):
+    results = index.search("corp", since=date_bound("2025-06-10T23:55:00Z"))
+    assert len(results) == 5
+    assert all(result["publication_date"] >= "2025-06-10T23:55" for result in results)
+    assert index.search("corp", until=date_bound("2025-06-09", end=True)) == []
+    assert len(index.search("corp", since=date_bound("2025-06-10"), until=date_bound("2025-06-10", end=True))) == 10
+
+
+def test_evicts_least_recently_indexed(tmp_path):
+    index = NewsIndex(tmp_path / "index.sqlite3", max_items=3)
+    page = load_fixture("headlines_small")
+    for item in page["data"][:5]:
+        index.add_headlines([extract_headline(item)], [extract_rics(item)])
+    assert index.info()["items"] == 3
+    assert index.search("acme") == []
+    assert story_ids(index.search("kaim")) == ["urn:newsml:reuters.com:20250610:nX0000004"]
+    index.close()
+
+
+def test_disabled_index_is_empty(tmp_path):
+    index = NewsIndex(tmp_path / "index.sqlite3", max_items=0)
+    index.add_headlines([extract_headline(load_fixture("headlines_small")["data"][0])], [[]])
+    assert index.search("acme") == []
+    assert not (tmp_path / "index.sqlite3").exists()
+
+
+def test_match_query():
+    assert match_query('MSFT.O "rate cut" earn* and (A OR b)') == (
+        '"MSFT.O" "rate cut" "earn"* AND ( "A" OR "b" )'
+    )
+
+
+def test_invalid_queries_and_dates(index):
+    with pytest.raises(ValueError):
+        index.search("(acme")
+    with pytest.raises(ValueError):
+        index.search('""')
+    with pytest.raises(ValueError):
+        date_bound("last week")
@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import base64
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add mcp-servers to path to import news_json
+sys.path.append(os.path.join(ROOT, "mcp-servers"))
+import news_json
+
+VALUE = {
+    "story_id": "urn:newsml:reuters.com:20250610:nL1N3SE0D8",
+    "headline": "Société Générale – résultats \"trimestriels\"",
+    "urgency": 3,
+    "next_cursor": None,
+    "headlines": [{"story_id": "a"}, {"story_id": "b"}],
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(news_json, "orjson", None)
+    elif news_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_round_trip(codec):
+    encoded = news_json.dumps(VALUE)
+    assert isinstance(encoded, str)
+    assert news_json.loads(encoded) == VALUE
+    assert news_json.loads(encoded.encode()) == VALUE
+
+
+def test_dumps_is_compact(codec):
+    encoded = news_json.dumps([{"a": 1}, {"b": 2}])
+    assert encoded == '[{"a":1},{"b":2}]'
+
+
+def test_codecs_decode_each_others_output(monkeypatch):
+    if news_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    fast = news_json.dumps(VALUE)
+    monkeypatch.setattr(news_json, "orjson", None)
+    stdlib = news_json.dumps(VALUE)
+    assert json.loads(fast) == json.loads(stdlib) == VALUE
+    assert news_json.loads(fast.encode()) == VALUE
+
+
+def test_loads_rejects_invalid_json(codec):
+    with pytest.raises(ValueError):
+        news_json.loads(b"<html>Service unavailable</html>")
+
+
+def filtered(document: bytes, chunk_size: int, min_bytes: int = 4096) -> tuple[dict, int]:
+    payload_filter = news_json.BinaryPayloadFilter(min_bytes)
+    for start in range(0, len(document), chunk_size):
+        payload_filter.feed(document[start : start + chunk_size])
+    return json.loads(payload_filter.getvalue()), payload_filter.skipped_bytes
+
+
+def story_response(content_type: str, data: str) -> dict:
+    return {
+        "newsItem": {
+            "contentMeta": {"headline": [{"$": "Markets \"rally\" on $ strength"}]},
+            "contentSet": {"inlineData": [{"$": data, "_contenttype": content_type}]},
+        }
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100, 1 << 20])
+def test_filter_drops_base64_payloads(chunk_size):
+    image = base64.b64encode(bytes(range(256)) * 64).decode()
+    document = json.dumps(story_response("image/jpeg", image)).replace("/", "\\/").encode()
+    data, skipped = filtered(document, chunk_size)
+    expected = story_response("image/jpeg", "")
+    assert data == expected
+    assert skipped >= len(image)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100, 1 << 20])
+def test_filter_keeps_text_and_escapes(chunk_size):
+    html = '<p class="lead">Shares rose 5% to $12.\\n</p>' * 500
+    response = story_response("text/html", html)
+    response["other"] = {"$": "\\\\", "list": ["$", "QUJD" * 2000, "\"$\":"]}
+    data, skipped = filtered(json.dumps(response, indent=1).encode(), chunk_size)
+    assert data == response
+    assert skipped == 0
+
+
+def test_filter_keeps_short_payloads():
+    response = story_response("image/png", "QUJD" * 10)
+    assert filtered(json.dumps(response).encode(), 8) == (response, 0)
@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import base64
+import asyncio
+import importlib.util
+
+import httpx
+import pytest
+from starlette.responses import JSONResponse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add mcp-servers and benchmarks to path to import rdp_auth and the mock RDP API
+sys.path.append(os.path.join(ROOT, "mcp-servers"))
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+import rdp_auth
+from mock_rdp_server import MockConfig, create_app
+from token_store import TokenStore
+
+
+class RecordingApp:
+    """The mock RDP API, recording the data requests made and answering 404 for "missing" stories"""
+
+    def __init__(self, config: MockConfig):
+        self.app = create_app(config)
+        self.requests: list[tuple[str, dict]] = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/data/"):
+            params = dict(httpx.QueryParams(scope["query_string"].decode()))
+            self.requests.append((scope["path"], params))
+            if scope["path"].endswith("/missing"):
+                await JSONResponse({"error": "not found"}, status_code=404)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    def headline_requests(self) -> list[dict]:
+        return [params for path, params in self.requests if path.endswith("/headlines")]
+
+    def story_requests(self) -> list[str]:
+        return [path.rsplit("/", 1)[1] for path, _ in self.requests if "/stories/" in path]
+
+
+@pytest.fixture
+def news_server(monkeypatch, tmp_path):
+    monkeypatch.setenv("RDP_STORY_CACHE_FILE", str(tmp_path / "stories.sqlite3"))
+    monkeypatch.setenv("RDP_NEWS_INDEX_FILE", str(tmp_path / "index.sqlite3"))
+    monkeypatch.setenv("RDP_HEADLINES_CACHE_TTL", "0")
+    spec = importlib.util.spec_from_file_location(
+        "news_server", os.path.join(ROOT, "mcp-servers", "news-server.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "RDP_BASE_URL", "http://mock")
+
+    monkeypatch.setattr(rdp_auth, "RDP_BASE_URL", "http://mock")
+    monkeypatch.setattr(rdp_auth, "RDP_USERNAME", "user")
+    monkeypatch.setattr(rdp_auth, "RDP_PASSWORD", "password")
+    monkeypatch.setattr(rdp_auth, "RDP_CLIENT_ID", "client")
+    monkeypatch.setattr(rdp_auth, "_token_store", TokenStore())
+    monkeypatch.setattr(rdp_auth, "_circuit_breakers", {})
+    monkeypatch.setattr(rdp_auth, "_rate_limiters", {})
+    yield module
+    module.story_cache.close()
+    module.news_index.close()
+
+
+def call(monkeypatch, app: RecordingApp, tool):
+    """Run a tool call with the news API requests served by app"""
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            monkeypatch.setattr(rdp_auth, "get_http_client", lambda: client)
+            return await tool()
+
+    return asyncio.run(main())
+
+
+def offset(cursor: str) -> int:
+    return int(base64.urlsafe_b64decode(cursor.encode()).decode().rpartition("|")[2])
+
+
+def titles(result: dict) -> list[str]:
+    return [headline["headline"] for headline in result["headlines"]]
+
+
+def test_limit_sets_the_pages_fetched(news_server, monkeypatch):
+    app = RecordingApp(MockConfig(headlines_total=1000))
+    result = json.loads(call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=250)))
+
+    assert [params["limit"] for params in app.headline_requests()] == ["100", "100", "50"]
+    assert titles(result) == [f"Tesla headline {i}" for i in range(250)]
+    assert offset(result["next_cursor"]) == 250
+
+    # Without a limit, a single page of the API's default size
+    result = json.loads(call(monkeypatch, app, lambda: news_server.get_headlines("Tesla")))
+    assert len(app.headline_requests()) == 4
+    assert app.headline_requests()[-1] == {"query": "Tesla"}
+    assert len(result["headlines"]) == 10
+
+
+def test_pages_are_clamped_to_the_maximum(news_server, monkeypatch):
+    monkeypatch.setattr(news_server, "HEADLINES_MAX_PAGES", 2)
+    app = RecordingApp(MockConfig(headlines_total=1000))
+
+    result = json.loads(call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=500)))
+    assert len(app.headline_requests()) == 2
+    assert len(result["headlines"]) == 200
+    assert offset(result["next_cursor"]) == 200
+
+    result = json.loads(
+        call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=500, max_pages=0))
+    )
+    assert len(app.headline_requests()) == 3
+    assert len(result["headlines"]) == 100
+
+
+def test_page_ending_part_way_through_the_limit(news_server, monkeypatch):
+    app = RecordingApp(MockConfig(headlines_total=1000))
+    result = json.loads(
+        call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=150, max_pages=1))
+    )
+    assert len(app.headline_requests()) == 1
+    assert len(result["headlines"]) == 100
+    assert offset(result["next_cursor"]) == 100
+
+
+def test_cursor_continues_the_search(news_server, monkeypatch):
+    app = RecordingApp(MockConfig(headlines_total=1000))
+    first = json.loads(call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=120)))
+
+    second = json.loads(
+        call(
+            monkeypatch,
+            app,
+            lambda: news_server.get_headlines("ignored", limit=130, cursor=first["next_cursor"]),
+        )
+    )
+    # Only the cursor is sent once one is given, for every page
+    assert [set(params) for params in app.headline_requests()[2:]] == [{"cursor", "limit"}] * 2
+    assert titles(second) == [f"Tesla headline {i}" for i in range(120, 250)]
+    assert offset(second["next_cursor"]) == 250
+
+
+def test_stops_when_headlines_run_out(news_server, monkeypatch):
+    app = RecordingApp(MockConfig(headlines_total=120))
+    result = json.loads(call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=500)))
+
+    assert [params["limit"] for params in app.headline_requests()] == ["100", "100"]
+    assert len(result["headlines"]) == 120
+    assert result["next_cursor"] is None
+
+
+def test_invalid_limit(news_server, monkeypatch):
+    app = RecordingApp(MockConfig())
+    result = call(monkeypatch, app, lambda: news_server.get_headlines("Tesla", limit=0))
+    assert result == "Error fetching news: limit must be a positive number"
+    assert app.requests == []
+
+
+def test_get_news_stories_order_duplicates_and_errors(news_server, monkeypatch):
+    app = RecordingApp(MockConfig(story_kb=1))
+    story_ids = ["n2", "n1", "missing", "n2"]
+    results = json.loads(
+        call(monkeypatch, app, lambda: news_server.get_news_stories(story_ids, max_chars=50))
+    )
+
+    assert [result["story_id"] for result in results] == story_ids
+    assert [result["status"] for result in results] == ["ok", "ok", "error", "ok"]
+    assert results[0]["story"]["headline"] == "Story n2"
+    assert results[1]["story"]["headline"] == "Story n1"
+    assert results[0] == results[3]
+    assert "404" in results[2]["error"]
+    # Each distinct story is fetched once
+    assert sorted(app.story_requests()) == ["missing", "n1", "n2"]
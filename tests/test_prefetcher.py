@@ -0,0 +1,73 @@
+import os
+import sys
+import asyncio
+
+# Add the MCP server directory to path to import the prefetcher
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers")
+)
+from prefetcher import StoryPrefetcher
+
+
+def make_prefetcher(saturated=False, **kwargs):
+    fetched = []
+
+    async def fetch(story_id):
+        await asyncio.sleep(0.02)
+        fetched.append(story_id)
+
+    prefetcher = StoryPrefetcher(
+        fetch=fetch,
+        is_cached=lambda story_id: story_id in fetched,
+        is_saturated=lambda: saturated,
+        **kwargs,
+    )
+    return prefetcher, fetched
+
+
+def test_prefetches_top_stories_within_budget():
+    prefetcher, fetched = make_prefetcher(top_n=3, max_in_flight=2)
+
+    async def main():
+        prefetcher.schedule(["a", "b", "c", "d"])
+        await asyncio.sleep(0.05)
+        prefetcher.record_request("a")
+        prefetcher.record_request("d")
+
+    asyncio.run(main())
+    assert sorted(fetched) == ["a", "b"]
+    info = prefetcher.info()
+    assert info["skipped_budget"] == 1
+    assert info["hits"] == 1
+    assert info["unused"] == 1
+
+
+def test_skips_while_limiter_saturated():
+    prefetcher, fetched = make_prefetcher(saturated=True, top_n=3)
+
+    async def main():
+        prefetcher.schedule(["a", "b"])
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert fetched == []
+    assert prefetcher.info()["skipped_saturated"] == 2
+
+
+def test_cancel_all_and_waste_accounting():
+    prefetcher, fetched = make_prefetcher(top_n=2, max_in_flight=2, track_window=1)
+
+    async def main():
+        prefetcher.schedule(["a", "b"])
+        await asyncio.sleep(0)
+        prefetcher.cancel_all()
+        await asyncio.sleep(0.05)
+        prefetcher.schedule(["c", "d"])
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    info = prefetcher.info()
+    assert info["cancelled"] == 2
+    assert info["completed"] == 2
+    # Only one prefetched story is tracked, the other fell out unused
+    assert info["wasted"] == 1
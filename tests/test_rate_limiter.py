@@ -0,0 +1,48 @@
+import os
+import sys
+import asyncio
+import time
+
+# Add the MCP server directory to path to import the rate limiter
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers")
+)
+import rdp_auth
+from rate_limiter import TokenBucket
+
+
+def test_burst_then_sustained_rate():
+    """A burst goes straight through, the rest is queued and released at the sustained rate"""
+    bucket = TokenBucket("test", rate=20, capacity=5)
+    depths = []
+
+    async def main():
+        start = time.monotonic()
+        tasks = [asyncio.create_task(bucket.acquire()) for _ in range(15)]
+        await asyncio.sleep(0.01)
+        depths.append(bucket.queue_depth)
+        await asyncio.gather(*tasks)
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+    assert depths == [10]
+    assert bucket.queue_depth == 0
+    assert 0.45 <= elapsed < 1.0
+
+
+def test_zero_rate_disables_limit():
+    bucket = TokenBucket("test", rate=0, capacity=0)
+
+    async def main():
+        await asyncio.gather(*[bucket.acquire() for _ in range(100)])
+
+    asyncio.run(main())
+    assert bucket.queue_depth == 0
+
+
+def test_headlines_and_stories_have_separate_buckets():
+    headlines = rdp_auth.get_rate_limiter(f"{rdp_auth.RDP_BASE_URL}/data/news/v1/headlines?query=MSFT.O")
+    stories = rdp_auth.get_rate_limiter(f"{rdp_auth.RDP_BASE_URL}/data/news/v1/stories/urn:newsml:1")
+    assert headlines.name == "headlines"
+    assert stories.name == "stories"
+    assert rdp_auth.get_rate_limiter(f"{rdp_auth.RDP_BASE_URL}/auth/oauth2/v1/token") is None
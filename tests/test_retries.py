@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the MCP server directory to path to import rdp_auth
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers")
+)
+import rdp_auth
+from circuit_breaker import CircuitOpenError
+from token_store import TokenStore
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Replies to each request with the next queued (status, headers) pair, then 200"""
+
+    responses = []
+    hits = 0
+
+    def _reply(self):
+        StubHandler.hits += 1
+        status, headers = StubHandler.responses.pop(0) if StubHandler.responses else (200, {})
+        body = json.dumps({"hit": StubHandler.hits}).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url(monkeypatch):
+    StubHandler.responses = []
+    StubHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    store = TokenStore()
+    store.save(
+        {
+            "access_token": "token",
+            "refresh_token": None,
+            "expires_at": datetime.now() + timedelta(hours=1),
+        }
+    )
+    monkeypatch.setattr(rdp_auth, "_token_store", store)
+    monkeypatch.setattr(rdp_auth, "_circuit_breakers", {})
+    monkeypatch.setattr(rdp_auth, "_rate_limiters", {})
+    monkeypatch.setattr(rdp_auth, "MAX_RETRIES", 3)
+    monkeypatch.setattr(rdp_auth, "RETRY_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(rdp_auth, "BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(rdp_auth, "BREAKER_RESET_TIMEOUT", 0.2)
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/data/news/v1/headlines"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def request(url, method="GET"):
+    async def main():
+        try:
+            return await rdp_auth.make_authenticated_request(url, method=method)
+        finally:
+            await rdp_auth.close_http_client()
+
+    return asyncio.run(main())
+
+
+def test_retries_server_errors_until_success(stub_url):
+    StubHandler.responses = [(503, {}), (502, {})]
+    response = request(stub_url)
+    assert response.status_code == 200
+    assert StubHandler.hits == 3
+
+
+def test_streamed_request_is_retried_and_left_unread(stub_url):
+    StubHandler.responses = [(503, {}), (502, {})]
+
+    async def main():
+        try:
+            response = await rdp_auth.make_authenticated_request(stub_url, stream=True)
+            assert not response.is_stream_consumed
+            body = b"".join([chunk async for chunk in response.aiter_bytes()])
+            await response.aclose()
+            return response.status_code, json.loads(body)
+        finally:
+            await rdp_auth.close_http_client()
+
+    assert asyncio.run(main()) == (200, {"hit": 3})
+
+
+def test_honours_retry_after(stub_url):
+    StubHandler.responses = [(429, {"Retry-After": "0.3"})]
+    loop_time = []
+
+    async def main():
+        start = asyncio.get_running_loop().time()
+        try:
+            response = await rdp_auth.make_authenticated_request(stub_url)
+        finally:
+            await rdp_auth.close_http_client()
+        loop_time.append(asyncio.get_running_loop().time() - start)
+        return response
+
+    assert asyncio.run(main()).status_code == 200
+    assert StubHandler.hits == 2
+    assert loop_time[0] >= 0.3
+
+
+def test_long_retry_after_is_returned_to_caller(stub_url):
+    StubHandler.responses = [(429, {"Retry-After": "3600"})]
+    assert request(stub_url).status_code == 429
+    assert StubHandler.hits == 1
+
+
+def test_post_is_not_retried(stub_url):
+    StubHandler.responses = [(503, {})]
+    assert request(stub_url, method="POST").status_code == 503
+    assert StubHandler.hits == 1
+
+
+def test_gives_up_after_max_retries(stub_url):
+    StubHandler.responses = [(500, {})] * 10
+    assert request(stub_url).status_code == 500
+    assert StubHandler.hits == rdp_auth.MAX_RETRIES + 1
+
+
+def test_circuit_opens_and_recovers(stub_url):
+    StubHandler.responses = [(503, {})] * 8
+    assert request(stub_url).status_code == 503
+    assert request(stub_url).status_code == 503
+    hits = StubHandler.hits
+
+    # Open: fails fast without reaching the server, for any story on the endpoint
+    with pytest.raises(CircuitOpenError):
+        request(stub_url)
+    assert StubHandler.hits == hits
+
+    # Other endpoints are unaffected
+    other_url = stub_url.replace("headlines", "stories/urn:newsml:1")
+    StubHandler.responses = []
+    assert request(other_url).status_code == 200
+
+    # After the reset timeout a trial request is let through and closes the circuit
+    asyncio.run(asyncio.sleep(0.25))
+    assert request(stub_url).status_code == 200
+    assert rdp_auth.get_circuit_breaker_info()[
+        rdp_auth._endpoint_key(stub_url)
+    ]["state"] == "closed"
@@ -0,0 +1,106 @@
+import os
+import sys
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add mcp-servers to path to import rdp_auth
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers"))
+import rdp_auth
+from token_store import TokenStore
+
+
+def token(expires_in: float) -> dict:
+    return {
+        "access_token": "token",
+        "refresh_token": None,
+        "expires_at": datetime.now() + timedelta(seconds=expires_in),
+    }
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = TokenStore()
+    monkeypatch.setattr(rdp_auth, "_token_store", store)
+    monkeypatch.setattr(rdp_auth, "_refresher_task", None)
+    monkeypatch.setattr(rdp_auth, "_refresher_state", dict(rdp_auth._refresher_state))
+    monkeypatch.setattr(rdp_auth, "TOKEN_REFRESH_LEAD", 60)
+    monkeypatch.setattr(rdp_auth, "TOKEN_REFRESH_JITTER", 0)
+    monkeypatch.setattr(rdp_auth, "TOKEN_REFRESH_BACKOFF_MIN", 5)
+    monkeypatch.setattr(rdp_auth, "TOKEN_REFRESH_BACKOFF_MAX", 300)
+    return store
+
+
+def test_refresh_delay(store):
+    assert rdp_auth._next_refresh_delay() == 0.0
+
+    store.save(token(3600))
+    assert 3539 < rdp_auth._next_refresh_delay() <= 3540
+
+    # Tokens living no longer than the lead, or already past expires_at, wait the minimum
+    store.save(token(30))
+    assert rdp_auth._next_refresh_delay() == 5
+    store.save(token(-10))
+    assert rdp_auth._next_refresh_delay() == 5
+
+    rdp_auth._refresher_state["consecutive_failures"] = 3
+    assert rdp_auth._next_refresh_delay() == 20
+    rdp_auth._refresher_state["consecutive_failures"] = 10
+    assert rdp_auth._next_refresh_delay() == 300
+
+
+def test_refresher_does_not_refresh_short_lived_tokens_back_to_back(store, monkeypatch):
+    monkeypatch.setattr(rdp_auth, "TOKEN_REFRESH_BACKOFF_MIN", 0.05)
+    fetches = []
+
+    async def fetch():
+        fetches.append(datetime.now())
+        # A token whose lifetime is within the lead
+        store.save(token(1))
+        return "token"
+
+    monkeypatch.setattr(rdp_auth, "_fetch_refreshed_token", fetch)
+
+    async def run():
+        rdp_auth.start_token_refresher()
+        await asyncio.sleep(0.32)
+        await rdp_auth.stop_token_refresher()
+
+    asyncio.run(run())
+    # One immediate refresh, as there was no token, then one every 0.05s
+    assert 3 <= len(fetches) <= 8
+    assert rdp_auth._refresher_state["last_error"] is None
+    assert rdp_auth._refresher_state["next_refresh_at"] is None
+
+
+def test_refresher_backs_off_after_failures(store, monkeypatch):
+    monkeypatch.setattr(rdp_auth, "TOKEN_REFRESH_BACKOFF_MIN", 0.05)
+    results = [RuntimeError("token endpoint down"), None, "token"]
+
+    async def fetch():
+        result = results.pop(0) if results else "token"
+        if isinstance(result, Exception):
+            raise result
+        if result:
+            store.save(token(3600))
+        return result
+
+    monkeypatch.setattr(rdp_auth, "_fetch_refreshed_token", fetch)
+
+    async def run():
+        rdp_auth.start_token_refresher()
+        await asyncio.sleep(0.02)
+        state = dict(rdp_auth._refresher_state)
+        await asyncio.sleep(0.3)
+        await rdp_auth.stop_token_refresher()
+        return state
+
+    after_first = asyncio.run(run())
+    assert after_first["consecutive_failures"] == 1
+    assert after_first["last_error"] == "RuntimeError: token endpoint down"
+    # Retried after 0.05s and 0.1s, then the new token is good for an hour
+    assert results == []
+    assert rdp_auth._refresher_state["consecutive_failures"] == 0
+    assert rdp_auth._refresher_state["last_error"] is None
+    assert rdp_auth._refresher_state["last_refresh_at"] is not None
@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import asyncio
+import threading
+import subprocess
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the MCP server directory to path to import the token store
+MCP_SERVERS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers"
+)
+sys.path.append(MCP_SERVERS_DIR)
+from token_store import FileTokenStore
+
+
+class FakeTokenHandler(BaseHTTPRequestHandler):
+    """Slow fake of the RDP token endpoint that counts grants"""
+
+    grants = 0
+    grants_lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with FakeTokenHandler.grants_lock:
+            FakeTokenHandler.grants += 1
+            grant = FakeTokenHandler.grants
+        time.sleep(0.3)
+
+        body = json.dumps(
+            {
+                "access_token": f"token-{grant}",
+                "refresh_token": f"refresh-{grant}",
+                "expires_in": "3600",
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_token_server():
+    FakeTokenHandler.grants = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTokenHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_save_and_load_across_instances(tmp_path):
+    """A token saved by one store is picked up by another once the file changes"""
+    path = tmp_path / "token.json"
+    writer = FileTokenStore(path)
+    reader = FileTokenStore(path)
+    assert reader.load()["access_token"] is None
+
+    expires_at = datetime.now() + timedelta(hours=1)
+    writer.save(
+        {"access_token": "abc", "refresh_token": "def", "expires_at": expires_at}
+    )
+
+    cache = reader.load()
+    assert cache["access_token"] == "abc"
+    assert cache["expires_at"] == expires_at
+    assert not list(tmp_path.glob("*.tmp"))
+
+    writer.clear()
+    assert reader.load()["access_token"] is None
+
+
+def test_corrupt_file_is_treated_as_empty(tmp_path):
+    path = tmp_path / "token.json"
+    path.write_text('{"access_token": "ab')
+    assert FileTokenStore(path).load()["access_token"] is None
+
+
+def test_lock_is_exclusive(tmp_path):
+    """Only one holder of the store lock at a time, even across store instances"""
+    path = tmp_path / "token.json"
+    stores = [FileTokenStore(path, lock_poll_interval=0.01) for _ in range(5)]
+    holders = []
+    max_holders = 0
+
+    async def hold(store):
+        nonlocal max_holders
+        async with store.lock():
+            holders.append(store)
+            max_holders = max(max_holders, len(holders))
+            await asyncio.sleep(0.02)
+            holders.remove(store)
+
+    async def main():
+        await asyncio.gather(*[hold(store) for store in stores])
+
+    asyncio.run(main())
+    assert max_holders == 1
+
+
+def test_processes_share_a_single_token(tmp_path, fake_token_server):
+    """Many news server processes starting together authenticate exactly once"""
+    env = os.environ.copy()
+    env.update(
+        {
+            "RDP_BASE_URL": fake_token_server,
+            "RDP_TOKEN_CACHE_FILE": str(tmp_path / "token.json"),
+            "RDP_USERNAME": "user",
+            "RDP_PASSWORD": "password",
+            "RDP_CLIENT_ID": "client",
+        }
+    )
+    script = "import asyncio, rdp_auth; print(asyncio.run(rdp_auth.get_valid_token()))"
+
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", script],
+            cwd=MCP_SERVERS_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for _ in range(8)
+    ]
+    tokens = [process.communicate(timeout=60)[0].strip() for process in processes]
+
+    assert tokens == ["token-1"] * len(processes)
+    assert FakeTokenHandler.grants == 1